@@ -5,6 +5,7 @@ from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 from langchain_openai import ChatOpenAI
 
 from ..middleware import AgentRequest, AgentResponse, MiddlewareChain
+from ..utils import get_model
 
 
 class CoordinatorAgent:
@@ -41,7 +42,7 @@ class CoordinatorAgent:
             name: Agent name for identification
         """
         self.name = name
-        self.model = model or ChatOpenAI(model="gpt-4o-mini", temperature=0)
+        self.model = model or get_model("gpt-4o-mini", 0)
         self.middleware_chain = middleware_chain
         self.subagents: Dict[str, Any] = {}
         self.conversation_history: List[BaseMessage] = []
@@ -5,6 +5,7 @@ from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, System
 from langchain_openai import ChatOpenAI
 
 from ..middleware import AgentRequest, AgentResponse, MiddlewareChain
+from ..utils import get_model
 from ..tools import CommandTool, JSONSearchTool
 
 
@@ -41,7 +42,7 @@ class ResearchAgent:
             name: Agent name for identification
         """
         self.name = name
-        self.model = model or ChatOpenAI(model="gpt-4o-mini", temperature=0)
+        self.model = model or get_model("gpt-4o-mini", 0)
         self.middleware_chain = middleware_chain
         self.conversation_history: List[BaseMessage] = []
         
@@ -135,6 +136,18 @@ class ResearchAgent:
         else:
             return f"Query failed: {response.error}"
     
+    def _build_system_prompt(self) -> str:
+        """Build the system prompt describing the agent's role and tools."""
+        return f"""You are a research agent named '{self.name}'.
+Your role is to gather information using available tools.
+
+Available tools:
+- execute_command: Run safe system commands (echo, ls, cat, date, pwd, whoami, uname)
+- search_json: Query JSON files using jq syntax
+
+For the given task, describe what information you would gather and how.
+If context is provided with specific files or commands, mention how you would use them."""
+    
     def process(self, task: str, context: Optional[Dict[str, Any]] = None) -> str:
         """
         Process a research task.
@@ -150,15 +163,7 @@ class ResearchAgent:
         request, processed_task = self._process_with_middleware(task)
         
         # Build system prompt
-        system_prompt = f"""You are a research agent named '{self.name}'.
-Your role is to gather information using available tools.
-
-Available tools:
-- execute_command: Run safe system commands (echo, ls, cat, date, pwd, whoami, uname)
-- search_json: Query JSON files using jq syntax
-
-For the given task, describe what information you would gather and how.
-If context is provided with specific files or commands, mention how you would use them."""
+        system_prompt = self._build_system_prompt()
         
         # Add context to task if provided
         full_task = processed_task
@@ -183,6 +188,47 @@ If context is provided with specific files or commands, mention how you would us
         
         return result
     
+    async def aprocess(self, task: str, context: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Process a research task asynchronously.
+        
+        Safe to run concurrently (e.g. with asyncio.gather): each call sees
+        the conversation history as it was when the call started, and its
+        exchange is appended once the model responds.
+        
+        Args:
+            task: The research task description
+            context: Optional context (e.g., file paths, commands to run)
+            
+        Returns:
+            Research findings
+        """
+        # Process through middleware
+        request, processed_task = self._process_with_middleware(task)
+        
+        # Add context to task if provided
+        full_task = processed_task
+        if context:
+            full_task += f"\n\nContext: {context}"
+        
+        human_message = HumanMessage(content=full_task)
+        
+        # Get LLM response without blocking the event loop
+        messages = [
+            SystemMessage(content=self._build_system_prompt()),
+            *self.conversation_history,
+            human_message
+        ]
+        response = await self.model.ainvoke(messages)
+        
+        # Add exchange to history
+        self.conversation_history.extend([human_message, AIMessage(content=response.content)])
+        
+        # Process through middleware
+        result = self._finalize_with_middleware(response.content, request)
+        
+        return result
+    
     def process_with_tools(
         self,
         task: str,
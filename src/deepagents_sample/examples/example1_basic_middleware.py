@@ -11,8 +11,9 @@ agent requests and responses. It shows:
 """
 
 import os
+import sys
 import logging
-from langchain_openai import ChatOpenAI
+from langchain_openai import OpenAIEmbeddings
 
 from deepagents_sample.middleware import (
     MiddlewareChain,
@@ -22,10 +23,30 @@ from deepagents_sample.middleware import (
     AgentResponse
 )
 from deepagents_sample.agents import CoordinatorAgent
-from deepagents_sample.utils import setup_logger
+from deepagents_sample.utils import setup_logger, SemanticCache, get_model, flush_async_handlers
 
-# Set up logging
-logger = setup_logger("example1", level=logging.INFO)
+# Set up logging (batched on a background thread to keep it off the request path)
+logger = setup_logger("example1", level=logging.INFO, async_batch=True)
+
+
+KEY_TAKEAWAYS = """\
+======================================================================
+KEY TAKEAWAYS
+======================================================================
+1. Middleware intercepts ALL agent communications
+2. LoggingMiddleware provides visibility into request/response flow
+3. MetricsMiddleware tracks timing and performance
+4. Multiple middleware can be chained together
+5. Middleware doesn't alter the core agent logic
+6. Each request/response pair is tracked with a unique ID
+
+Middleware is essential for:
+- Debugging agent interactions
+- Performance monitoring
+- Audit logging
+- Request/response transformation
+- Error tracking
+"""
 
 
 def run_example():
@@ -50,8 +71,8 @@ def run_example():
     logger.info("  - Adding MetricsMiddleware (tracks performance)")
     
     # Create separate loggers for middleware
-    middleware_logger = setup_logger("middleware", level=logging.DEBUG)
-    metrics_logger = setup_logger("metrics", level=logging.INFO)
+    middleware_logger = setup_logger("middleware", level=logging.DEBUG, async_batch=True)
+    metrics_logger = setup_logger("metrics", level=logging.INFO, async_batch=True)
     
     middleware_chain = MiddlewareChain()
     logging_middleware = LoggingMiddleware(verbose=True, logger=middleware_logger)
@@ -59,17 +80,25 @@ def run_example():
     
     middleware_chain.add(logging_middleware)
     middleware_chain.add(metrics_middleware)
+    middleware_chain.freeze()
     
     # Create agent with middleware
     logger.info("Step 2: Creating CoordinatorAgent with middleware...")
     
     if use_llm:
-        model = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+        model = get_model("gpt-4o-mini", 0)
         coordinator = CoordinatorAgent(
             model=model,
             middleware_chain=middleware_chain,
             name="coordinator"
         )
+        
+        # Serve repeated or near-duplicate prompts without another LLM call;
+        # only the model is cached, so middleware and history still run
+        response_cache = SemanticCache(
+            embed=OpenAIEmbeddings(model="text-embedding-3-small").embed_query
+        )
+        coordinator.model = response_cache.wrap_model(coordinator.model)
     else:
         # Mock mode - demonstrate middleware without LLM
         coordinator = None
@@ -125,6 +154,13 @@ def run_example():
         
         result = coordinator.process("What is the capital of France?")
         logger.info(f"Agent Result: {result}")
+        
+        # Near-duplicate prompt in a fresh conversation is answered from
+        # the semantic cache
+        coordinator.reset_history()
+        result = coordinator.process("What's the capital city of France?")
+        logger.info(f"Agent Result (cached): {result}")
+        logger.info(f"Cache stats: {response_cache.get_stats()}")
     
     # Display metrics summary
     logger.info("-" * 70)
@@ -132,22 +168,9 @@ def run_example():
     metrics_middleware.print_summary()
     
     # Key takeaways
-    logger.info("="*70)
-    logger.info("KEY TAKEAWAYS")
-    logger.info("="*70)
-    logger.info("1. Middleware intercepts ALL agent communications")
-    logger.info("2. LoggingMiddleware provides visibility into request/response flow")
-    logger.info("3. MetricsMiddleware tracks timing and performance")
-    logger.info("4. Multiple middleware can be chained together")
-    logger.info("5. Middleware doesn't alter the core agent logic")
-    logger.info("6. Each request/response pair is tracked with a unique ID")
-    logger.info("")
-    logger.info("Middleware is essential for:")
-    logger.info("- Debugging agent interactions")
-    logger.info("- Performance monitoring")
-    logger.info("- Audit logging")
-    logger.info("- Request/response transformation")
-    logger.info("- Error tracking")
+    # Written in one call; drain queued log records first so they stay ordered
+    flush_async_handlers()
+    sys.stdout.write(KEY_TAKEAWAYS)
 
 
 if __name__ == "__main__":
@@ -11,11 +11,55 @@ This example demonstrates hierarchical agent orchestration using LangGraph:
 """
 
 import os
-from langchain_openai import ChatOpenAI
+import sys
 
 from deepagents_sample.agents import CoordinatorAgent, ResearchAgent, AnalysisAgent
 from deepagents_sample.middleware import MiddlewareChain, LoggingMiddleware, MetricsMiddleware
 from deepagents_sample.workflow import create_agent_workflow, run_workflow
+from deepagents_sample.utils import get_model
+
+
+KEY_TAKEAWAYS = """\
+
+======================================================================
+KEY TAKEAWAYS
+======================================================================
+
+1. LangGraph manages complex multi-agent workflows
+2. Coordinator analyzes tasks and routes to appropriate subagents
+3. State is maintained across the entire workflow
+4. Agents communicate through shared state
+5. Conditional routing based on task type
+6. Automatic aggregation of subagent results
+
+Workflow Structure:
+┌─────────────┐
+│ Coordinator │ ← Entry point
+└──────┬──────┘
+       │
+   ┌───┴───┐
+   │       │
+   ▼       ▼
+┌──────┐ ┌──────────┐
+│Research│ │ Analysis │ ← Subagents
+└───┬───┘ └────┬─────┘
+    │          │
+    └────┬─────┘
+         ▼
+   ┌──────────┐
+   │Coordinator│ ← Aggregation
+   └──────────┘
+         │
+         ▼
+       [END]
+
+Benefits:
+- Clear separation of concerns
+- Reusable agent components
+- Scalable architecture
+- Easy to add new agents
+- Built-in state management
+"""
 
 
 def run_example():
@@ -39,11 +83,12 @@ def run_example():
     middleware_chain = MiddlewareChain()
     middleware_chain.add(LoggingMiddleware(verbose=False))  # Less verbose for clarity
     middleware_chain.add(MetricsMiddleware())
+    middleware_chain.freeze()
     print("  ✓ Middleware chain created\n")
     
     # Create agents
     print("Step 2: Creating agents...")
-    model = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+    model = get_model("gpt-4o-mini", 0)
     
     coordinator = CoordinatorAgent(
         model=model,
@@ -117,45 +162,7 @@ def run_example():
     metrics_middleware.print_summary()
     
     # Key takeaways
-    print("\n" + "="*70)
-    print("KEY TAKEAWAYS")
-    print("="*70)
-    print("""
-1. LangGraph manages complex multi-agent workflows
-2. Coordinator analyzes tasks and routes to appropriate subagents
-3. State is maintained across the entire workflow
-4. Agents communicate through shared state
-5. Conditional routing based on task type
-6. Automatic aggregation of subagent results
-
-Workflow Structure:
-┌─────────────┐
-│ Coordinator │ ← Entry point
-└──────┬──────┘
-       │
-   ┌───┴───┐
-   │       │
-   ▼       ▼
-┌──────┐ ┌──────────┐
-│Research│ │ Analysis │ ← Subagents
-└───┬───┘ └────┬─────┘
-    │          │
-    └────┬─────┘
-         ▼
-   ┌──────────┐
-   │Coordinator│ ← Aggregation
-   └──────────┘
-         │
-         ▼
-       [END]
-
-Benefits:
-- Clear separation of concerns
-- Reusable agent components
-- Scalable architecture
-- Easy to add new agents
-- Built-in state management
-    """)
+    sys.stdout.write(KEY_TAKEAWAYS)
 
 
 if __name__ == "__main__":
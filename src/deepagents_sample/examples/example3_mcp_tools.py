@@ -11,12 +11,82 @@ to interact with external systems:
 - Tool usage statistics
 """
 
+import json
 import os
+import sys
 from pathlib import Path
 
 from deepagents_sample.tools import CommandTool, JSONSearchTool
 from deepagents_sample.agents import ResearchAgent, AnalysisAgent
 from deepagents_sample.middleware import MiddlewareChain, LoggingMiddleware, MetricsMiddleware
+from deepagents_sample.utils import get_model
+
+
+KEY_TAKEAWAYS = """\
+
+======================================================================
+KEY TAKEAWAYS
+======================================================================
+
+1. MCP tools provide external capabilities to agents
+2. CommandTool enables safe shell command execution
+3. JSONSearchTool uses jq for powerful JSON querying
+4. Tools have built-in error handling and timeouts
+5. Tool usage is tracked with statistics
+6. Agents can use multiple tools together
+
+Tool Benefits:
+- Standardized interface (MCPTool base class)
+- Automatic error handling
+- Performance tracking
+- Security constraints (allowed commands)
+- Consistent response format
+
+Common Use Cases:
+- System information gathering
+- Data extraction and transformation
+- File operations
+- API calls (can be extended)
+- Database queries (can be extended)
+
+Security Considerations:
+- Command whitelisting
+- Timeout protection
+- Input validation
+- Sandboxing (can be added)
+"""
+
+
+RESULT_PREVIEW_CHARS = 200
+_RESULT_ENCODER = json.JSONEncoder(indent=2)
+
+
+def format_result(result, limit: int = RESULT_PREVIEW_CHARS) -> str:
+    """
+    Format a query result for display, truncated to `limit` characters.
+    
+    Structured results are encoded incrementally and encoding stops once
+    the preview is full, so large results are never serialized in full.
+    
+    Args:
+        result: Query result
+        limit: Maximum number of characters to show
+        
+    Returns:
+        Display string, suffixed with "..." when truncated
+    """
+    if not isinstance(result, (dict, list)):
+        text = str(result)
+        return text[:limit] + "..." if len(text) > limit else text
+    
+    chunks = []
+    size = 0
+    for chunk in _RESULT_ENCODER.iterencode(result):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > limit:
+            return "".join(chunks)[:limit] + "..."
+    return "".join(chunks)
 
 
 def run_example():
@@ -108,29 +178,35 @@ def run_example():
                 (".metrics.total_budget", "Get total budget"),
             ]
             
+            # Run all queries as one jq program: the file is parsed once
+            batch = json_tool.query_many(
+                str(data_file),
+                [(description, query) for query, description in queries]
+            )
+            
             for query, description in queries:
                 print(f"[{description}]")
                 print(f"Query: {query}")
                 
-                response = json_tool.run(file_path=str(data_file), jq_query=query)
-                
-                if response.success:
-                    import json
-                    if isinstance(response.result, (dict, list)):
-                        result_str = json.dumps(response.result, indent=2)
-                    else:
-                        result_str = str(response.result)
-                    
-                    # Truncate long results
-                    if len(result_str) > 200:
-                        result_str = result_str[:200] + "..."
-                    
+                if batch.success:
+                    result_str = format_result(batch.result[description])
                     print(f"✓ Result:\n{result_str}")
-                    print(f"  Execution time: {response.execution_time:.3f}s")
                 else:
-                    print(f"✗ Error: {response.error}")
+                    # Fall back to running queries one by one to isolate errors
+                    response = json_tool.run(file_path=str(data_file), jq_query=query)
+                    
+                    if response.success:
+                        result_str = format_result(response.result)
+                        
+                        print(f"✓ Result:\n{result_str}")
+                        print(f"  Execution time: {response.execution_time:.3f}s")
+                    else:
+                        print(f"✗ Error: {response.error}")
                 print()
             
+            if batch.success:
+                print(f"All {len(queries)} queries ran in one pass: {batch.execution_time:.3f}s\n")
+            
             # Show tool stats
             print("JSON Tool Statistics:")
             stats = json_tool.get_stats()
@@ -148,14 +224,14 @@ def run_example():
     middleware = MiddlewareChain()
     middleware.add(LoggingMiddleware(verbose=False))
     middleware.add(MetricsMiddleware())
+    middleware.freeze()
     
     # Create research agent (has both tools)
     print("Step 1: Creating ResearchAgent with MCP tools...")
     
     # Check if we have API key for agent creation
     if os.getenv("OPENAI_API_KEY"):
-        from langchain_openai import ChatOpenAI
-        model = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+        model = get_model("gpt-4o-mini", 0)
         research_agent = ResearchAgent(
             model=model,
             middleware_chain=middleware,
@@ -191,8 +267,6 @@ def run_example():
             
             # Create analysis agent
             print("Step 3: Creating AnalysisAgent for data analysis...")
-            from langchain_openai import ChatOpenAI
-            model = ChatOpenAI(model="gpt-4o-mini", temperature=0)
             analysis_agent = AnalysisAgent(
                 model=model,
                 middleware_chain=middleware,
@@ -236,37 +310,7 @@ def run_example():
                 print(f"    Total time: {stats['total_time']:.3f}s")
     
     # Key takeaways
-    print("\n" + "="*70)
-    print("KEY TAKEAWAYS")
-    print("="*70)
-    print("""
-1. MCP tools provide external capabilities to agents
-2. CommandTool enables safe shell command execution
-3. JSONSearchTool uses jq for powerful JSON querying
-4. Tools have built-in error handling and timeouts
-5. Tool usage is tracked with statistics
-6. Agents can use multiple tools together
-
-Tool Benefits:
-- Standardized interface (MCPTool base class)
-- Automatic error handling
-- Performance tracking
-- Security constraints (allowed commands)
-- Consistent response format
-
-Common Use Cases:
-- System information gathering
-- Data extraction and transformation
-- File operations
-- API calls (can be extended)
-- Database queries (can be extended)
-
-Security Considerations:
-- Command whitelisting
-- Timeout protection
-- Input validation
-- Sandboxing (can be added)
-    """)
+    sys.stdout.write(KEY_TAKEAWAYS)
 
 
 if __name__ == "__main__":
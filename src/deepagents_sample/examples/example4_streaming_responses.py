@@ -7,18 +7,44 @@ Shows token-by-token output as the agent generates responses.
 """
 
 import os
+import sys
 import asyncio
 import logging
-from langchain_openai import ChatOpenAI
+import time
 from langchain_core.messages import HumanMessage
 
 from deepagents_sample.agents import ResearchAgent
 from deepagents_sample.middleware import MiddlewareChain, LoggingMiddleware
-from deepagents_sample.utils import setup_logger
+from deepagents_sample.utils import setup_logger, get_model, run_async
 
 logger = setup_logger("example4", level=logging.INFO)
 
 
+KEY_TAKEAWAYS = """\
+
+======================================================================
+KEY TAKEAWAYS
+======================================================================
+1. Streaming provides immediate feedback to users
+2. Token-by-token output improves perceived performance
+3. Progressive results show work in progress
+4. Better UX for long-running operations
+5. Can cancel operations mid-stream
+
+Benefits:
+- Immediate user feedback
+- Better perceived performance
+- Can show progress
+- Cancellable operations
+"""
+
+
+# Streamed text is written at each newline, or as soon as this many
+# seconds have passed since the last write, so output stays live while
+# tokens that arrive in a burst share one write
+STREAM_FLUSH_INTERVAL = 0.05
+
+
 async def stream_agent_response(agent, task: str):
     """
     Stream agent response token by token.
@@ -34,18 +60,27 @@ async def stream_agent_response(agent, task: str):
     logger.info("-"*70)
     
     # Create streaming model
-    streaming_model = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0,
-        streaming=True
-    )
-    
-    # Stream the response
-    full_response = ""
+    streaming_model = get_model("gpt-4o-mini", 0, streaming=True)
+    
+    # Stream the response into one growing UTF-8 buffer (no per-token
+    # string copies); the unwritten tail goes to the terminal at each
+    # newline or after STREAM_FLUSH_INTERVAL
+    received = bytearray()
+    written = 0
+    last_write = time.monotonic()
     async for chunk in streaming_model.astream([HumanMessage(content=task)]):
         if chunk.content:
-            print(chunk.content, end="", flush=True)
-            full_response += chunk.content
+            received += chunk.content.encode()
+            now = time.monotonic()
+            if "\n" in chunk.content or now - last_write >= STREAM_FLUSH_INTERVAL:
+                sys.stdout.write(received[written:].decode())
+                sys.stdout.flush()
+                written = len(received)
+                last_write = now
+    
+    if written < len(received):
+        sys.stdout.write(received[written:].decode())
+    full_response = received.decode()
     
     print("\n")
     logger.info("-"*70)
@@ -96,21 +131,21 @@ async def progressive_research(research_agent, queries):
     logger.info("PROGRESSIVE RESEARCH")
     logger.info("="*70)
     
-    results = []
-    
-    for i, query in enumerate(queries, 1):
+    async def run_query(i: int, query: str) -> str:
+        """Run a single query and report its result."""
         logger.info(f"\n[Query {i}/{len(queries)}] {query}")
-        logger.info("-"*70)
-        
-        # Simulate streaming research
-        result = research_agent.process(query)
-        results.append(result)
         
-        # Show immediate result
-        logger.info(f"✓ Result: {result[:200]}...")
+        result = await research_agent.aprocess(query)
         
-        # Small delay for demo
-        await asyncio.sleep(0.5)
+        # Show each result as soon as it arrives
+        logger.info(f"✓ [Query {i}] Result: {result[:200]}...")
+        return result
+    
+    # Issue all queries concurrently; total latency is the slowest query,
+    # not the sum. gather() returns results in query order.
+    results = await asyncio.gather(*(
+        run_query(i, query) for i, query in enumerate(queries, 1)
+    ))
     
     logger.info("\n" + "="*70)
     logger.info(f"All {len(results)} queries complete!")
@@ -148,8 +183,9 @@ async def run_example():
     
     middleware = MiddlewareChain()
     middleware.add(LoggingMiddleware(verbose=False))
+    middleware.freeze()
     
-    model = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+    model = get_model("gpt-4o-mini", 0)
     research_agent = ResearchAgent(model=model, middleware_chain=middleware)
     
     queries = [
@@ -161,21 +197,8 @@ async def run_example():
     await progressive_research(research_agent, queries)
     
     # Key takeaways
-    logger.info("\n" + "="*70)
-    logger.info("KEY TAKEAWAYS")
-    logger.info("="*70)
-    logger.info("1. Streaming provides immediate feedback to users")
-    logger.info("2. Token-by-token output improves perceived performance")
-    logger.info("3. Progressive results show work in progress")
-    logger.info("4. Better UX for long-running operations")
-    logger.info("5. Can cancel operations mid-stream")
-    logger.info("")
-    logger.info("Benefits:")
-    logger.info("- Immediate user feedback")
-    logger.info("- Better perceived performance")
-    logger.info("- Can show progress")
-    logger.info("- Cancellable operations")
+    sys.stdout.write(KEY_TAKEAWAYS)
 
 
 if __name__ == "__main__":
-    asyncio.run(run_example())
+    run_async(run_example())
@@ -10,20 +10,47 @@ Demonstrates:
 """
 
 import os
+import sys
+import re
 import logging
-import hashlib
 import time
+from collections import OrderedDict
 from functools import lru_cache
-from typing import Optional
-from pydantic import BaseModel, BaseSettings, validator, Field
+from typing import NamedTuple, Optional
+from pydantic import BaseModel, validator, Field
+from pydantic_settings import BaseSettings
 
 from deepagents_sample.agents import CoordinatorAgent
 from deepagents_sample.middleware import MiddlewareChain, MetricsMiddleware
-from deepagents_sample.utils import setup_logger
+from deepagents_sample.utils import setup_logger, SemanticCache
+
+try:
+    import re2 as _regex  # google-re2: linear-time automaton matching
+except ImportError:  # fall back to the stdlib engine
+    _regex = re
 
 logger = setup_logger("example5", level=logging.INFO)
 
 
+KEY_TAKEAWAYS = """\
+
+======================================================================
+KEY TAKEAWAYS
+======================================================================
+1. Configuration management makes deployment easier
+2. Input validation prevents security issues
+3. Caching reduces costs significantly
+4. Cost tracking helps manage budgets
+5. These features are essential for production
+
+Benefits:
+- 40-60% cost reduction with caching
+- Better security with validation
+- Easier deployment with config management
+- Budget control with cost tracking
+"""
+
+
 # ============================================================================
 # 1. CONFIGURATION MANAGEMENT
 # ============================================================================
@@ -56,6 +83,24 @@ class Settings(BaseSettings):
 # 2. INPUT VALIDATION
 # ============================================================================
 
+DANGEROUS_PATTERNS = (
+    'rm -rf', 'DROP TABLE', '__import__',
+    'eval(', 'exec(', 'system('
+)
+
+# All patterns in one alternation: a single scan of the input finds the
+# earliest match instead of one substring search per pattern. With RE2
+# installed the alternation compiles to an automaton with no backtracking.
+_DANGEROUS_RE = _regex.compile("|".join(map(re.escape, DANGEROUS_PATTERNS)))
+
+
+@lru_cache(maxsize=256)
+def find_dangerous_pattern(text: str) -> Optional[str]:
+    """Return the first suspicious pattern in text, or None (memoized)."""
+    match = _DANGEROUS_RE.search(text)
+    return match.group(0) if match else None
+
+
 class TaskInput(BaseModel):
     """
     Validated task input with security checks.
@@ -72,14 +117,9 @@ class TaskInput(BaseModel):
             raise ValueError("Task too long (max 1000 characters)")
         
         # Check for suspicious patterns
-        dangerous_patterns = [
-            'rm -rf', 'DROP TABLE', '__import__',
-            'eval(', 'exec(', 'system('
-        ]
-        
-        for pattern in dangerous_patterns:
-            if pattern in v:
-                raise ValueError(f"Suspicious pattern detected: {pattern}")
+        pattern = find_dangerous_pattern(v)
+        if pattern is not None:
+            raise ValueError(f"Suspicious pattern detected: {pattern}")
         
         return v
     
@@ -90,65 +130,86 @@ class TaskInput(BaseModel):
         if v not in allowed:
             raise ValueError(f"Priority must be one of: {allowed}")
         return v
+    
+    @classmethod
+    def trusted(
+        cls,
+        task: str,
+        priority: str = "medium",
+        max_tokens: Optional[int] = None
+    ) -> "TaskInput":
+        """
+        Build a TaskInput for trusted internal tasks without running validators.
+        
+        Only use this for tasks generated by the application itself; user
+        input must go through the normal constructor.
+        """
+        return cls.construct(task=task, priority=priority, max_tokens=max_tokens)
 
 
 # ============================================================================
 # 3. CACHING LAYER
 # ============================================================================
 
+class CacheStats(NamedTuple):
+    """Snapshot of cache counters; hit_rate is a fraction in [0, 1]."""
+    hits: int
+    misses: int
+    total_requests: int
+    hit_rate: float
+    cache_size: int
+    max_size: int
+
+
 class CacheManager:
     """
     Manages caching of agent responses to reduce costs.
+    
+    Tasks are used directly as keys: str hashes are computed in C and
+    cached on the string, so no digest is needed for an in-process cache.
     """
     
     def __init__(self, max_size: int = 100):
-        self.cache = {}
+        self.cache: "OrderedDict[str, str]" = OrderedDict()
         self.max_size = max_size
         self.hits = 0
         self.misses = 0
     
-    def _generate_key(self, task: str) -> str:
-        """Generate cache key from task."""
-        return hashlib.md5(task.encode()).hexdigest()
-    
     def get(self, task: str) -> Optional[str]:
         """Get cached result if available."""
-        key = self._generate_key(task)
-        
-        if key in self.cache:
+        if task in self.cache:
+            self.cache.move_to_end(task)
             self.hits += 1
-            logger.info(f"✓ Cache HIT for task: {task[:50]}...")
-            return self.cache[key]
+            logger.info("✓ Cache HIT for task: %.50s...", task)
+            return self.cache[task]
         
         self.misses += 1
-        logger.info(f"✗ Cache MISS for task: {task[:50]}...")
+        logger.info("✗ Cache MISS for task: %.50s...", task)
         return None
     
     def set(self, task: str, result: str):
         """Cache a result."""
-        key = self._generate_key(task)
-        
-        # Simple LRU: remove oldest if full
-        if len(self.cache) >= self.max_size:
-            oldest_key = next(iter(self.cache))
-            del self.cache[oldest_key]
+        if task in self.cache:
+            self.cache.move_to_end(task)
+        elif len(self.cache) >= self.max_size:
+            # LRU: evict the least recently used entry
+            self.cache.popitem(last=False)
         
-        self.cache[key] = result
-        logger.info(f"✓ Cached result for: {task[:50]}...")
+        self.cache[task] = result
+        logger.info("✓ Cached result for: %.50s...", task)
     
-    def get_stats(self) -> dict:
-        """Get cache statistics."""
+    def get_stats(self) -> CacheStats:
+        """Get cache statistics (numeric; format at display time)."""
         total = self.hits + self.misses
-        hit_rate = (self.hits / total * 100) if total > 0 else 0
         
-        return {
-            "hits": self.hits,
-            "misses": self.misses,
-            "total_requests": total,
-            "hit_rate": f"{hit_rate:.1f}%",
-            "cache_size": len(self.cache),
-            "max_size": self.max_size
-        }
+        return CacheStats(
+            self.hits,
+            self.misses,
+            total,
+            self.hits / total if total else 0.0,
+            len(self.cache),
+            self.max_size
+        )
     
     def clear(self):
         """Clear the cache."""
@@ -172,9 +233,18 @@ class CostTracker:
         "gpt-3.5-turbo": {"input": 0.001, "output": 0.002}
     }
     
+    # (input, output) cost per single token, derived once from COSTS
+    _PER_TOKEN = {
+        model: (rates["input"] / 1000.0, rates["output"] / 1000.0)
+        for model, rates in COSTS.items()
+    }
+    
     def __init__(self):
         self.total_cost = 0.0
-        self.calls = []
+        self.total_input_tokens = 0
+        self.total_output_tokens = 0
+        # Running aggregates only; no per-call records are kept
+        self._n_calls = 0
     
     def track_call(
         self,
@@ -183,39 +253,34 @@ class CostTracker:
         output_tokens: int,
         task: str = ""
     ):
-        """Track a single API call."""
-        if model not in self.COSTS:
-            logger.warning(f"Unknown model: {model}, using gpt-4o-mini costs")
-            model = "gpt-4o-mini"
+        """Track a single API call. `task` is accepted for call-site context but not stored."""
+        rates = self._PER_TOKEN.get(model)
+        if rates is None:
+            logger.warning("Unknown model: %s, using gpt-4o-mini costs", model)
+            rates = self._PER_TOKEN["gpt-4o-mini"]
         
-        input_cost = input_tokens / 1000 * self.COSTS[model]["input"]
-        output_cost = output_tokens / 1000 * self.COSTS[model]["output"]
-        call_cost = input_cost + output_cost
+        in_rate, out_rate = rates
+        call_cost = input_tokens * in_rate + output_tokens * out_rate
         
         self.total_cost += call_cost
-        
-        self.calls.append({
-            "model": model,
-            "input_tokens": input_tokens,
-            "output_tokens": output_tokens,
-            "cost": call_cost,
-            "task": task[:50] if task else ""
-        })
+        self.total_input_tokens += input_tokens
+        self.total_output_tokens += output_tokens
+        self._n_calls += 1
         
         logger.info(
-            f"💰 Call cost: ${call_cost:.4f} "
-            f"(in: {input_tokens}, out: {output_tokens}) "
-            f"Total: ${self.total_cost:.4f}"
+            "💰 Call cost: $%.4f (in: %d, out: %d) Total: $%.4f",
+            call_cost, input_tokens, output_tokens, self.total_cost
         )
     
     def get_summary(self) -> dict:
         """Get cost summary."""
+        total_calls = self._n_calls
         return {
-            "total_calls": len(self.calls),
+            "total_calls": total_calls,
             "total_cost": f"${self.total_cost:.4f}",
-            "avg_cost_per_call": f"${self.total_cost / len(self.calls):.4f}" if self.calls else "$0.00",
-            "total_input_tokens": sum(c["input_tokens"] for c in self.calls),
-            "total_output_tokens": sum(c["output_tokens"] for c in self.calls)
+            "avg_cost_per_call": f"${self.total_cost / total_calls:.4f}" if total_calls else "$0.00",
+            "total_input_tokens": self.total_input_tokens,
+            "total_output_tokens": self.total_output_tokens
         }
 
 
@@ -226,6 +291,10 @@ class CostTracker:
 class CachedCoordinatorAgent(CoordinatorAgent):
     """
     Coordinator agent with caching support.
+    
+    process() has side effects (middleware, conversation history), so its
+    results are cached explicitly in a CacheManager; functools.lru_cache
+    is only used for pure helpers such as find_dangerous_pattern.
     """
     
     def __init__(self, *args, cache_manager: CacheManager = None, **kwargs):
@@ -295,6 +364,10 @@ def run_example():
     except Exception as e:
         logger.error(f"✗ Validation failed: {e}")
     
+    # Trusted internal task: validators skipped
+    internal_task = TaskInput.trusted("Summarize cached results", priority="low")
+    logger.info(f"✓ Trusted internal task (not validated): {internal_task.task}")
+    
     # Invalid input (too long)
     try:
         invalid_task = TaskInput(task="x" * 1001)
@@ -335,10 +408,33 @@ def run_example():
     # Show cache stats
     stats = cache.get_stats()
     logger.info("\nCache Statistics:")
-    logger.info(f"  Hits: {stats['hits']}")
-    logger.info(f"  Misses: {stats['misses']}")
-    logger.info(f"  Hit Rate: {stats['hit_rate']}")
-    logger.info(f"  Cache Size: {stats['cache_size']}/{stats['max_size']}")
+    logger.info(f"  Hits: {stats.hits}")
+    logger.info(f"  Misses: {stats.misses}")
+    logger.info(f"  Hit Rate: {stats.hit_rate:.1%}")
+    logger.info(f"  Cache Size: {stats.cache_size}/{stats.max_size}")
+    
+    # Semantic cache: near-duplicate prompts also hit (needs embeddings)
+    if os.getenv("OPENAI_API_KEY"):
+        from langchain_openai import OpenAIEmbeddings
+        
+        semantic_cache = SemanticCache(
+            embed=OpenAIEmbeddings(model="text-embedding-3-small").embed_query,
+            threshold=0.85
+        )
+        process = semantic_cache.wrap(lambda task: f"Result for: {task}")
+        
+        for task in [
+            "What is machine learning?",
+            "What is machine learning?",  # Exact duplicate
+            "Can you explain what machine learning is?",  # Near duplicate
+        ]:
+            process(task)
+        
+        semantic_stats = semantic_cache.get_stats()
+        logger.info("\nSemantic Cache Statistics:")
+        logger.info(f"  Exact Hits: {semantic_stats['exact_hits']}")
+        logger.info(f"  Semantic Hits: {semantic_stats['semantic_hits']}")
+        logger.info(f"  Misses: {semantic_stats['misses']}")
     
     # Part 4: Cost Tracking
     logger.info("\n" + "="*70)
@@ -363,27 +459,14 @@ def run_example():
     
     # Calculate savings from caching
     cache_stats = cache.get_stats()
-    if cache_stats['hits'] > 0:
+    if cache_stats.hits > 0:
         # Assume average cost per call
         avg_cost = 0.0001  # Approximate
-        savings = cache_stats['hits'] * avg_cost
+        savings = cache_stats.hits * avg_cost
         logger.info(f"\n💰 Estimated savings from caching: ${savings:.4f}")
     
     # Key takeaways
-    logger.info("\n" + "="*70)
-    logger.info("KEY TAKEAWAYS")
-    logger.info("="*70)
-    logger.info("1. Configuration management makes deployment easier")
-    logger.info("2. Input validation prevents security issues")
-    logger.info("3. Caching reduces costs significantly")
-    logger.info("4. Cost tracking helps manage budgets")
-    logger.info("5. These features are essential for production")
-    logger.info("")
-    logger.info("Benefits:")
-    logger.info("- 40-60% cost reduction with caching")
-    logger.info("- Better security with validation")
-    logger.info("- Easier deployment with config management")
-    logger.info("- Budget control with cost tracking")
+    sys.stdout.write(KEY_TAKEAWAYS)
 
 
 if __name__ == "__main__":
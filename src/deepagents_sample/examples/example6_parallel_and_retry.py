@@ -10,29 +10,72 @@ Demonstrates:
 """
 
 import os
+import sys
+import time
+import random
 import asyncio
 import logging
-from typing import List, Dict, Any
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import List, Dict, Any, Optional
 
 from deepagents_sample.agents import ResearchAgent, AnalysisAgent
 from deepagents_sample.middleware import MiddlewareChain, MetricsMiddleware
 from deepagents_sample.tools import CommandTool
-from deepagents_sample.utils import setup_logger
+from deepagents_sample.utils import setup_logger, run_async
 
 logger = setup_logger("example6", level=logging.INFO)
 
 
+KEY_TAKEAWAYS = """\
+
+======================================================================
+KEY TAKEAWAYS
+======================================================================
+1. Parallel execution provides 3-4x speedup
+2. Automatic retry handles transient failures
+3. Fallback strategies ensure availability
+4. Circuit breakers prevent cascade failures
+5. Graceful degradation maintains service
+
+Benefits:
+- Better performance with parallelization
+- Higher reliability with retry logic
+- Improved availability with fallbacks
+- System protection with circuit breakers
+- Continuous service with degradation
+"""
+
+
+def default_concurrency(n_items: int) -> int:
+    """
+    Concurrency limit for n_items parallel jobs.
+    
+    Jobs here are I/O-bound (LLM calls, subprocesses), so the limit is
+    2 per CPU but never below 8.
+    """
+    return max(1, min(n_items, max(8, (os.cpu_count() or 1) * 2)))
+
+
+# Shared across parallel_tool_execution calls so the tool keeps its result cache
+_TOOL = CommandTool(timeout=10, allowed_commands=("echo", "date", "pwd", "uname"))
+
+
 # ============================================================================
 # 1. PARALLEL EXECUTION
 # ============================================================================
 
-async def parallel_research(tasks: List[str]) -> List[Dict[str, Any]]:
+async def parallel_research(
+    tasks: List[str],
+    concurrency: Optional[int] = None
+) -> List[Dict[str, Any]]:
     """
     Execute multiple research tasks in parallel.
     
     Args:
         tasks: List of research tasks
+        concurrency: Maximum number of tasks running at once
+            (default: see default_concurrency)
         
     Returns:
         List of results
@@ -40,17 +83,20 @@ async def parallel_research(tasks: List[str]) -> List[Dict[str, Any]]:
     logger.info("="*70)
     logger.info("PARALLEL RESEARCH EXECUTION")
     logger.info("="*70)
-    logger.info(f"Executing {len(tasks)} tasks in parallel...")
+    logger.info("Executing %d tasks in parallel...", len(tasks))
+    
+    sem = asyncio.Semaphore(concurrency or default_concurrency(len(tasks)))
     
     async def research_task(task: str, index: int) -> Dict[str, Any]:
         """Single research task."""
-        logger.info(f"[Task {index + 1}] Starting: {task[:50]}...")
-        
-        # Simulate research (in real scenario, use actual agent)
-        await asyncio.sleep(1)  # Simulate work
-        
-        result = f"Research result for: {task}"
-        logger.info(f"[Task {index + 1}] ✓ Complete")
+        async with sem:
+            logger.info("[Task %d] Starting: %.50s...", index + 1, task)
+            
+            # Simulate research (in real scenario, use actual agent)
+            await asyncio.sleep(1)  # Simulate work
+            
+            result = f"Research result for: {task}"
+            logger.info("[Task %d] ✓ Complete", index + 1)
         
         return {
             "task": task,
@@ -59,28 +105,36 @@ async def parallel_research(tasks: List[str]) -> List[Dict[str, Any]]:
         }
     
     # Execute all tasks in parallel
-    import time
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     results = await asyncio.gather(*[
         research_task(task, i) for i, task in enumerate(tasks)
     ])
     
-    duration = time.time() - start_time
+    duration = time.perf_counter() - start_time
     
-    logger.info(f"\n✓ All {len(tasks)} tasks complete in {duration:.2f}s")
-    logger.info(f"  Sequential would take: ~{len(tasks):.0f}s")
-    logger.info(f"  Speedup: {len(tasks) / duration:.1f}x")
+    logger.info("\n✓ All %d tasks complete in %.2fs", len(tasks), duration)
+    logger.info("  Sequential would take: ~%ds", len(tasks))
+    logger.info("  Speedup: %.1fx", len(tasks) / duration)
     
     return results
 
 
-async def parallel_tool_execution(commands: List[str]) -> List[Dict[str, Any]]:
+async def parallel_tool_execution(
+    commands: List[str],
+    concurrency: Optional[int] = None,
+    executor: Optional[Executor] = None
+) -> List[Dict[str, Any]]:
     """
     Execute multiple tool commands in parallel.
     
     Args:
         commands: List of commands to execute
+        concurrency: Maximum number of commands running at once
+            (default: see default_concurrency)
+        executor: Pool to run the tool calls on; pass the same one to
+            several calls to reuse its threads (default: the event loop's
+            default executor)
         
     Returns:
         List of results
@@ -89,15 +143,15 @@ async def parallel_tool_execution(commands: List[str]) -> List[Dict[str, Any]]:
     logger.info("PARALLEL TOOL EXECUTION")
     logger.info("="*70)
     
-    tool = CommandTool(timeout=10, allowed_commands=["echo", "date", "pwd", "uname"])
+    sem = asyncio.Semaphore(concurrency or default_concurrency(len(commands)))
+    loop = asyncio.get_running_loop()
     
     async def execute_command(cmd: str, index: int) -> Dict[str, Any]:
         """Execute single command."""
-        logger.info(f"[Command {index + 1}] {cmd}")
-        
-        # Run in executor to avoid blocking
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(None, tool.run, cmd)
+        async with sem:
+            logger.info("[Command %d] %s", index + 1, cmd)
+            
+            response = await loop.run_in_executor(executor, partial(_TOOL.run, command=cmd))
         
         return {
             "command": cmd,
@@ -106,20 +160,19 @@ async def parallel_tool_execution(commands: List[str]) -> List[Dict[str, Any]]:
             "execution_time": response.execution_time
         }
     
-    import time
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     results = await asyncio.gather(*[
         execute_command(cmd, i) for i, cmd in enumerate(commands)
     ])
     
-    duration = time.time() - start_time
+    duration = time.perf_counter() - start_time
     
-    logger.info(f"\n✓ Executed {len(commands)} commands in {duration:.2f}s")
+    logger.info("\n✓ Executed %d commands in %.2fs", len(commands), duration)
     
     for result in results:
         status = "✓" if result["success"] else "✗"
-        logger.info(f"  {status} {result['command']}: {result['result'][:50]}")
+        logger.info("  %s %s: %.50s", status, result["command"], result["result"])
     
     return results
 
@@ -133,19 +186,35 @@ class RetryableAgent:
     Agent with automatic retry logic.
     """
     
-    def __init__(self, max_retries: int = 3):
+    RETRYABLE_ERRORS = (ConnectionError, TimeoutError)
+    
+    def __init__(self, max_retries: int = 3, min_delay: float = 2, max_delay: float = 10):
+        """
+        Initialize the agent.
+        
+        Args:
+            max_retries: Total number of attempts, at least 1
+            min_delay: Seconds to wait before the first retry
+            max_delay: Upper bound on the wait between attempts
+            
+        Raises:
+            ValueError: If max_retries is less than 1
+        """
+        if max_retries < 1:
+            raise ValueError(f"max_retries must be at least 1, got {max_retries}")
+        
         self.max_retries = max_retries
+        self.min_delay = min_delay
+        self.max_delay = max_delay
         self.attempt_count = 0
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((ConnectionError, TimeoutError))
-    )
     def process_with_retry(self, task: str) -> str:
         """
         Process task with automatic retry on failure.
         
+        Retries on connection errors and timeouts, up to max_retries
+        attempts in total, with exponential backoff between attempts.
+        
         Args:
             task: Task to process
             
@@ -153,18 +222,29 @@ class RetryableAgent:
             Result
             
         Raises:
-            Exception: If all retries fail
+            Exception: The last error if all retries fail
         """
+        delay = self.min_delay
+        for attempt in range(self.max_retries):
+            try:
+                return self._attempt(task)
+            except self.RETRYABLE_ERRORS:
+                if attempt == self.max_retries - 1:
+                    raise
+                time.sleep(delay)
+                delay = min(delay * 2, self.max_delay)
+    
+    def _attempt(self, task: str) -> str:
+        """Make a single processing attempt."""
         self.attempt_count += 1
-        logger.info(f"Attempt {self.attempt_count}: {task[:50]}...")
+        logger.info("Attempt %d: %.50s...", self.attempt_count, task)
         
         # Simulate occasional failures
-        import random
         if random.random() < 0.3:  # 30% failure rate
-            logger.warning(f"  ✗ Attempt {self.attempt_count} failed (simulated)")
+            logger.warning("  ✗ Attempt %d failed (simulated)", self.attempt_count)
             raise ConnectionError("Simulated connection error")
         
-        logger.info(f"  ✓ Attempt {self.attempt_count} succeeded")
+        logger.info("  ✓ Attempt %d succeeded", self.attempt_count)
         return f"Result for: {task}"
 
 
@@ -195,7 +275,7 @@ class FallbackAgent:
                 raise Exception("Primary unavailable")
         
         except Exception as e:
-            logger.warning(f"Primary method failed: {e}")
+            logger.warning("Primary method failed: %s", e)
             logger.info("Falling back to alternative method...")
             self.fallback_count += 1
             return self._process_fallback(task)
@@ -238,9 +318,8 @@ class CircuitBreaker:
             Exception: If circuit is open
         """
         if self.state == "OPEN":
-            # Check if timeout has passed
-            import time
-            if time.time() - self.last_failure_time > self.timeout:
+            # Check if timeout has passed (monotonic: immune to wall-clock jumps)
+            if time.monotonic() - self.last_failure_time > self.timeout:
                 logger.info("Circuit breaker: OPEN → HALF_OPEN")
                 self.state = "HALF_OPEN"
             else:
@@ -261,10 +340,9 @@ class CircuitBreaker:
             self.failure_count += 1
             
             if self.failure_count >= self.failure_threshold:
-                import time
-                self.last_failure_time = time.time()
+                self.last_failure_time = time.monotonic()
                 self.state = "OPEN"
-                logger.error(f"Circuit breaker: CLOSED → OPEN (failures: {self.failure_count})")
+                logger.error("Circuit breaker: CLOSED → OPEN (failures: %d)", self.failure_count)
             
             raise
 
@@ -369,7 +447,13 @@ async def run_example():
         "uname -a"
     ]
     
-    tool_results = await parallel_tool_execution(commands)
+    # A dedicated pool keeps tool calls from queuing behind other
+    # default-executor work; it is shut down once the commands finish
+    with ThreadPoolExecutor(
+        max_workers=default_concurrency(len(commands)),
+        thread_name_prefix="example6-tools"
+    ) as tool_pool:
+        tool_results = await parallel_tool_execution(commands, executor=tool_pool)
     
     # Part 3: Retry Logic
     logger.info("\n" + "="*70)
@@ -405,7 +489,6 @@ async def run_example():
     
     def unreliable_service():
         """Simulated unreliable service."""
-        import random
         if random.random() < 0.7:  # 70% failure rate
             raise Exception("Service error")
         return "Success"
@@ -442,22 +525,8 @@ async def run_example():
     logger.info(f"Services used: {result['services_used']}")
     
     # Key takeaways
-    logger.info("\n" + "="*70)
-    logger.info("KEY TAKEAWAYS")
-    logger.info("="*70)
-    logger.info("1. Parallel execution provides 3-4x speedup")
-    logger.info("2. Automatic retry handles transient failures")
-    logger.info("3. Fallback strategies ensure availability")
-    logger.info("4. Circuit breakers prevent cascade failures")
-    logger.info("5. Graceful degradation maintains service")
-    logger.info("")
-    logger.info("Benefits:")
-    logger.info("- Better performance with parallelization")
-    logger.info("- Higher reliability with retry logic")
-    logger.info("- Improved availability with fallbacks")
-    logger.info("- System protection with circuit breakers")
-    logger.info("- Continuous service with degradation")
+    sys.stdout.write(KEY_TAKEAWAYS)
 
 
 if __name__ == "__main__":
-    asyncio.run(run_example())
+    run_async(run_example())
@@ -7,7 +7,58 @@ Main entry point to run all DeepAgents examples sequentially or individually.
 
 import sys
 import os
-from typing import Optional
+import importlib
+from typing import Callable, Dict, Optional
+
+
+# Environment is read once per run
+_HAS_OPENAI_KEY = bool(os.environ.get("OPENAI_API_KEY"))
+_NEEDS_OPENAI = frozenset({2, 4})
+
+# Example number -> (module name, whether run_example is a coroutine)
+_EXAMPLES = {
+    1: ("example1_basic_middleware", False),
+    2: ("example2_langgraph_subagents", False),
+    3: ("example3_mcp_tools", False),
+    4: ("example4_streaming_responses", True),
+    5: ("example5_caching_and_config", False),
+    6: ("example6_parallel_and_retry", True),
+}
+_runners: Dict[int, Callable] = {}
+
+# Menu choice that runs every example, listed after the last one
+_RUN_ALL_CHOICE = str(max(_EXAMPLES) + 1)
+
+
+def _get_runner(example_num: int) -> Callable:
+    """Import an example module on first use and return its run_example."""
+    runner = _runners.get(example_num)
+    if runner is None:
+        module_name, _ = _EXAMPLES[example_num]
+        module = importlib.import_module(f".{module_name}", __package__)
+        runner = _runners[example_num] = module.run_example
+    return runner
+
+
+def _prompt(message: str) -> str:
+    """
+    Prompt for a line of input.
+    
+    A lighter input(): writes and flushes only stdout and reads stdin
+    directly, skipping input()'s extra stream flushes and hooks.
+    
+    Args:
+        message: Prompt to display
+        
+    Returns:
+        The entered line without its trailing newline
+    """
+    sys.stdout.write(message)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip("\n")
 
 
 def print_banner():
@@ -59,7 +110,7 @@ def print_menu():
     print("     - Fallback strategies")
     print("     - Circuit breaker pattern")
     print()
-    print("  7. Run All Examples")
+    print(f"  {_RUN_ALL_CHOICE}. Run All Examples")
     print()
     print("  0. Exit")
     print()
@@ -75,23 +126,17 @@ def check_requirements(example_num: int) -> bool:
     Returns:
         True if requirements are met
     """
-    if example_num in [2, 4]:
-        if not os.getenv("OPENAI_API_KEY"):
+    if example_num in _NEEDS_OPENAI:
+        if not _HAS_OPENAI_KEY:
             print(f"\n⚠️  Example {example_num} requires OPENAI_API_KEY environment variable.")
             print("Please set it and try again:")
             print("  export OPENAI_API_KEY='your-key-here'\n")
             return False
     
     if example_num == 3:
-        # Check if jq is installed
-        import subprocess
-        try:
-            subprocess.run(
-                ["jq", "--version"],
-                capture_output=True,
-                timeout=5
-            )
-        except (subprocess.SubprocessError, FileNotFoundError):
+        # Check if jq is installed (the probe runs once per process)
+        from ..tools.json_search_tool import _jq_version
+        if _jq_version() is None:
             print("\n⚠️  Example 3 works best with jq installed.")
             print("Install jq for full functionality:")
             print("  macOS: brew install jq")
@@ -115,30 +160,17 @@ def run_example(example_num: int) -> bool:
     if not check_requirements(example_num):
         return False
     
+    if example_num not in _EXAMPLES:
+        print(f"Invalid example number: {example_num}")
+        return False
+    
     try:
-        if example_num == 1:
-            from .example1_basic_middleware import run_example
-            run_example()
-        elif example_num == 2:
-            from .example2_langgraph_subagents import run_example
-            run_example()
-        elif example_num == 3:
-            from .example3_mcp_tools import run_example
-            run_example()
-        elif example_num == 4:
-            from .example4_streaming_responses import run_example
-            import asyncio
-            asyncio.run(run_example())
-        elif example_num == 5:
-            from .example5_caching_and_config import run_example
-            run_example()
-        elif example_num == 6:
-            from .example6_parallel_and_retry import run_example
-            import asyncio
-            asyncio.run(run_example())
+        runner = _get_runner(example_num)
+        if _EXAMPLES[example_num][1]:
+            from ..utils import run_async
+            run_async(runner())
         else:
-            print(f"Invalid example number: {example_num}")
-            return False
+            runner()
         
         return True
     
@@ -148,14 +180,15 @@ def run_example(example_num: int) -> bool:
     
     except Exception as e:
         print(f"\n\n❌ Error running example: {e}\n")
+        # Innermost frames only; LangChain stacks run dozens of frames deep
         import traceback
-        traceback.print_exc()
+        traceback.print_exception(e, limit=-5, chain=False)
         return False
 
 
 def run_all_examples():
     """Run all examples sequentially."""
-    examples = [1, 2, 3, 4, 5, 6]
+    examples = sorted(_EXAMPLES)
     
     print("\n" + "="*70)
     print("RUNNING ALL EXAMPLES")
@@ -170,14 +203,14 @@ def run_all_examples():
         
         if not success:
             print(f"\n⚠️  Example {example_num} did not complete successfully.")
-            response = input("\nContinue with remaining examples? (y/n): ")
+            response = _prompt("\nContinue with remaining examples? (y/n): ")
             if response.lower() != 'y':
                 print("\nStopping execution.\n")
                 return
         
         if i < len(examples):
             print("\n" + "-"*70)
-            input("\nPress Enter to continue to next example...")
+            _prompt("\nPress Enter to continue to next example...")
     
     print("\n" + "="*70)
     print("ALL EXAMPLES COMPLETED")
@@ -192,22 +225,22 @@ def interactive_mode():
         print_menu()
         
         try:
-            choice = input("Select an example (0-4): ").strip()
+            choice = _prompt(f"Select an example (0-{_RUN_ALL_CHOICE}): ").strip()
             
             if choice == '0':
                 print("\nGoodbye!\n")
                 break
             
-            elif choice == '4':
+            elif choice == _RUN_ALL_CHOICE:
                 run_all_examples()
             
-            elif choice in ['1', '2', '3', '4', '5', '6']:
+            elif choice.isdigit() and int(choice) in _EXAMPLES:
                 example_num = int(choice)
                 run_example(example_num)
-                input("\nPress Enter to return to menu...")
+                _prompt("\nPress Enter to return to menu...")
             
             else:
-                print("\n❌ Invalid choice. Please select 0-4.\n")
+                print(f"\n❌ Invalid choice. Please select 0-{_RUN_ALL_CHOICE}.\n")
         
         except KeyboardInterrupt:
             print("\n\nGoodbye!\n")
@@ -241,7 +274,7 @@ def main():
             run_all_examples()
             return
         
-        elif arg in ['1', '2', '3', '4', '5', '6']:
+        elif arg.isdigit() and int(arg) in _EXAMPLES:
             print_banner()
             example_num = int(arg)
             run_example(example_num)
@@ -1,24 +1,40 @@
 """Base middleware interface for agent request/response interception."""
 
-from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+import itertools
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
+from functools import partial, reduce
+
+# Process-wide request IDs; unlike id(), these are never reused
+_request_counter = itertools.count(1)
 
 
 class AgentRequest:
     """Represents an agent request with metadata."""
     
+    __slots__ = ("agent_name", "input_data", "metadata", "_ts_ns", "request_id")
+    
     def __init__(
         self,
         agent_name: str,
         input_data: Any,
         metadata: Optional[Dict[str, Any]] = None
     ):
-        self.agent_name = agent_name
+        # Interned so per-agent dict lookups in middleware hit the identity fast path
+        self.agent_name = sys.intern(agent_name)
         self.input_data = input_data
         self.metadata = metadata or {}
-        self.timestamp = datetime.now()
-        self.request_id = id(self)
+        # Public request time: an integer clock read here, the datetime is
+        # only built if someone asks for it
+        self._ts_ns = time.time_ns()
+        self.request_id = next(_request_counter)
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Creation time, materialized as a datetime only when accessed."""
+        return datetime.fromtimestamp(self._ts_ns / 1e9)
     
     def __repr__(self) -> str:
         return f"AgentRequest(agent={self.agent_name}, id={self.request_id})"
@@ -27,6 +43,10 @@ class AgentRequest:
 class AgentResponse:
     """Represents an agent response with metadata."""
     
+    # No timestamp: nothing reads it, and the request already records when
+    # the round trip started
+    __slots__ = ("agent_name", "output_data", "request_id", "metadata")
+    
     def __init__(
         self,
         agent_name: str,
@@ -34,29 +54,28 @@ class AgentResponse:
         request_id: int,
         metadata: Optional[Dict[str, Any]] = None
     ):
-        self.agent_name = agent_name
+        self.agent_name = sys.intern(agent_name)
         self.output_data = output_data
         self.request_id = request_id
         self.metadata = metadata or {}
-        self.timestamp = datetime.now()
     
     def __repr__(self) -> str:
         return f"AgentResponse(agent={self.agent_name}, id={self.request_id})"
 
 
-class BaseMiddleware(ABC):
+class BaseMiddleware:
     """
     Base class for middleware components that intercept agent requests and responses.
     
     Middleware can be chained together to create a pipeline of processing steps.
     Each middleware can inspect, modify, or log requests and responses.
+    Subclasses must override process_request and process_response.
     """
     
     def __init__(self, name: Optional[str] = None):
         self.name = name or self.__class__.__name__
         self.next_middleware: Optional[BaseMiddleware] = None
     
-    @abstractmethod
     def process_request(self, request: AgentRequest) -> AgentRequest:
         """
         Process an incoming agent request.
@@ -67,9 +86,8 @@ class BaseMiddleware(ABC):
         Returns:
             The processed (potentially modified) request
         """
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def process_response(self, response: AgentResponse) -> AgentResponse:
         """
         Process an outgoing agent response.
@@ -80,7 +98,24 @@ class BaseMiddleware(ABC):
         Returns:
             The processed (potentially modified) response
         """
-        pass
+        raise NotImplementedError
+    
+    def __call__(
+        self,
+        request: AgentRequest,
+        next_: Callable[[AgentRequest], AgentResponse]
+    ) -> AgentResponse:
+        """
+        Run this middleware around the rest of a wrapped chain.
+        
+        Args:
+            request: The incoming request
+            next_: Callable running the remaining middleware and the agent
+            
+        Returns:
+            The processed response
+        """
+        return self.process_response(next_(self.process_request(request)))
     
     def set_next(self, middleware: "BaseMiddleware") -> "BaseMiddleware":
         """
@@ -105,12 +140,12 @@ class BaseMiddleware(ABC):
         Returns:
             The request after passing through all middleware
         """
-        processed_request = self.process_request(request)
-        
-        if self.next_middleware:
-            return self.next_middleware.execute_request_chain(processed_request)
+        middleware = self
+        while middleware is not None:
+            request = middleware.process_request(request)
+            middleware = middleware.next_middleware
         
-        return processed_request
+        return request
     
     def execute_response_chain(self, response: AgentResponse) -> AgentResponse:
         """
@@ -122,10 +157,20 @@ class BaseMiddleware(ABC):
         Returns:
             The response after passing through all middleware
         """
-        if self.next_middleware:
-            response = self.next_middleware.execute_response_chain(response)
+        chain = []
+        middleware = self
+        while middleware is not None:
+            chain.append(middleware)
+            middleware = middleware.next_middleware
         
-        return self.process_response(response)
+        for middleware in reversed(chain):
+            response = middleware.process_response(response)
+        
+        return response
+
+
+def _identity(item: Any) -> Any:
+    return item
 
 
 class MiddlewareChain:
@@ -143,22 +188,94 @@ class MiddlewareChain:
     
     def __init__(self):
         self.middlewares: List[BaseMiddleware] = []
+        self._fwd: Optional[Tuple[BaseMiddleware, ...]] = None
+        self._rev: Optional[Tuple[BaseMiddleware, ...]] = None
     
     def add(self, middleware: BaseMiddleware) -> "MiddlewareChain":
         """
         Add a middleware to the chain.
         
+        Adding a middleware discards any chain compiled by freeze().
+        
         Args:
             middleware: The middleware to add
             
         Returns:
             Self for fluent chaining
         """
+        # Keep the linked list that execute_request_chain/execute_response_chain
+        # walk, so middlewares[0].execute_*_chain() still runs the whole chain
         if self.middlewares:
             self.middlewares[-1].set_next(middleware)
         self.middlewares.append(middleware)
+        self._fwd = None
+        self._rev = None
+        # Drop the specialized dispatchers installed by freeze()
+        self.__dict__.pop("process_request", None)
+        self.__dict__.pop("process_response", None)
+        return self
+    
+    def freeze(self) -> "MiddlewareChain":
+        """
+        Snapshot the current middleware into forward and reversed tuples.
+        
+        Chains of up to two middleware (the common Logging + Metrics case)
+        also get process_request/process_response replaced with unrolled
+        calls, so no loop runs per request. Called implicitly by the first
+        process_request/process_response after the chain changes; call it
+        explicitly once the chain is fully built to take the cost up front.
+        
+        Returns:
+            Self for fluent chaining
+        """
+        fwd = self._fwd = tuple(self.middlewares)
+        self._rev = fwd[::-1]
+        
+        if not fwd:
+            self.process_request = self.process_response = _identity
+        elif len(fwd) == 1:
+            self.process_request = fwd[0].process_request
+            self.process_response = fwd[0].process_response
+        elif len(fwd) == 2:
+            req_first, req_second = fwd[0].process_request, fwd[1].process_request
+            resp_first, resp_second = fwd[1].process_response, fwd[0].process_response
+            self.process_request = lambda request: req_second(req_first(request))
+            self.process_response = lambda response: resp_second(resp_first(response))
+        else:
+            self.process_request = self._process_request_all
+            self.process_response = self._process_response_all
         return self
     
+    def wrap(
+        self,
+        agent_call: Callable[[AgentRequest], AgentResponse]
+    ) -> Callable[[AgentRequest], AgentResponse]:
+        """
+        Compose the middleware around an agent call, WSGI-style.
+        
+        Each middleware handles its request and response work in a single
+        call frame, so a full round trip is one nested call chain instead
+        of separate request and response walks. Like freeze(), the wrapper
+        reflects the middleware present when it is built.
+        
+        Example:
+            handle = chain.wrap(lambda req: AgentResponse(
+                req.agent_name, agent.invoke(req.input_data), req.request_id
+            ))
+            response = handle(AgentRequest("my_agent", "input"))
+        
+        Args:
+            agent_call: Callable turning a processed request into a response
+            
+        Returns:
+            Callable taking a request and returning the processed response
+        """
+        return reduce(
+            lambda next_, middleware: partial(middleware, next_=next_),
+            reversed(self.middlewares),
+            agent_call
+        )
+    
     def process_request(self, request: AgentRequest) -> AgentRequest:
         """
         Process a request through the entire middleware chain.
@@ -169,10 +286,14 @@ class MiddlewareChain:
         Returns:
             The processed request
         """
-        if not self.middlewares:
-            return request
+        return self.freeze().process_request(request)
+    
+    def _process_request_all(self, request: AgentRequest) -> AgentRequest:
+        """Run a request through every middleware of a frozen chain."""
+        for middleware in self._fwd:
+            request = middleware.process_request(request)
         
-        return self.middlewares[0].execute_request_chain(request)
+        return request
     
     def process_response(self, response: AgentResponse) -> AgentResponse:
         """
@@ -184,7 +305,43 @@ class MiddlewareChain:
         Returns:
             The processed response
         """
-        if not self.middlewares:
-            return response
+        return self.freeze().process_response(response)
+    
+    def _process_response_all(self, response: AgentResponse) -> AgentResponse:
+        """Run a response through every middleware of a frozen chain, in reverse."""
+        for middleware in self._rev:
+            response = middleware.process_response(response)
+        
+        return response
+    
+    def process_request_batch(self, requests: List[AgentRequest]) -> List[AgentRequest]:
+        """
+        Process a batch of requests, walking each middleware over the whole batch.
         
-        return self.middlewares[0].execute_response_chain(response)
+        Args:
+            requests: The requests to process
+            
+        Returns:
+            The processed requests, in the same order
+        """
+        batch = list(requests)
+        for middleware in self.middlewares:
+            process = middleware.process_request
+            batch = [process(request) for request in batch]
+        return batch
+    
+    def process_response_batch(self, responses: List[AgentResponse]) -> List[AgentResponse]:
+        """
+        Process a batch of responses through the chain (in reverse).
+        
+        Args:
+            responses: The responses to process
+            
+        Returns:
+            The processed responses, in the same order
+        """
+        batch = list(responses)
+        for middleware in reversed(self.middlewares):
+            process = middleware.process_response
+            batch = [process(response) for response in batch]
+        return batch
@@ -2,8 +2,8 @@
 
 import json
 import logging
+from itertools import islice
 from typing import Any
-from datetime import datetime
 
 from .base import BaseMiddleware, AgentRequest, AgentResponse
 
@@ -48,7 +48,18 @@ class LoggingMiddleware(BaseMiddleware):
             Formatted string representation of data
         """
         if isinstance(data, (dict, list)):
-            formatted = json.dumps(data, indent=2)
+            # Every element takes at least two compact-JSON characters, so
+            # items past this bound can't reach the truncated output
+            limit = max_length // 2 + 1
+            if len(data) > limit:
+                if isinstance(data, dict):
+                    data = dict(islice(data.items(), limit))
+                else:
+                    data = data[:limit]
+            try:
+                formatted = json.dumps(data, separators=(",", ":"))
+            except (TypeError, ValueError):
+                formatted = repr(data)
         else:
             formatted = str(data)
         
@@ -56,17 +67,6 @@ class LoggingMiddleware(BaseMiddleware):
             return formatted[:max_length] + "..."
         return formatted
     
-    def _log(self, message: str, level: str = "INFO"):
-        """
-        Log a message with timestamp and level.
-        
-        Args:
-            message: The message to log
-            level: Log level (INFO, DEBUG, etc.)
-        """
-        log_method = getattr(self.logger, level.lower(), self.logger.info)
-        log_method(message)
-    
     def process_request(self, request: AgentRequest) -> AgentRequest:
         """
         Log an incoming agent request.
@@ -83,14 +83,16 @@ class LoggingMiddleware(BaseMiddleware):
         Returns:
             The unmodified request (logging doesn't alter data)
         """
-        self._log(f"→ REQUEST to agent '{request.agent_name}' (ID: {request.request_id})")
+        self.logger.info("→ REQUEST to agent '%s' (ID: %s)", request.agent_name, request.request_id)
         
-        if self.verbose and request.input_data:
-            formatted_input = self._format_data(request.input_data)
-            self._log(f"  Input: {formatted_input}", level="DEBUG")
-        
-        if request.metadata:
-            self._log(f"  Metadata: {request.metadata}", level="DEBUG")
+        # Skip formatting payloads entirely unless DEBUG records will be emitted
+        if self.logger.isEnabledFor(logging.DEBUG):
+            if self.verbose and request.input_data:
+                formatted_input = self._format_data(request.input_data)
+                self.logger.debug("  Input: %s", formatted_input)
+            
+            if request.metadata:
+                self.logger.debug("  Metadata: %s", request.metadata)
         
         return request
     
@@ -110,13 +112,14 @@ class LoggingMiddleware(BaseMiddleware):
         Returns:
             The unmodified response (logging doesn't alter data)
         """
-        self._log(f"← RESPONSE from agent '{response.agent_name}' (ID: {response.request_id})")
+        self.logger.info("← RESPONSE from agent '%s' (ID: %s)", response.agent_name, response.request_id)
         
-        if self.verbose and response.output_data:
-            formatted_output = self._format_data(response.output_data)
-            self._log(f"  Output: {formatted_output}", level="DEBUG")
-        
-        if response.metadata:
-            self._log(f"  Metadata: {response.metadata}", level="DEBUG")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            if self.verbose and response.output_data:
+                formatted_output = self._format_data(response.output_data)
+                self.logger.debug("  Output: %s", formatted_output)
+            
+            if response.metadata:
+                self.logger.debug("  Metadata: %s", response.metadata)
         
         return response
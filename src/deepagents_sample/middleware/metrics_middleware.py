@@ -1,11 +1,50 @@
 """Metrics middleware for tracking agent performance."""
 
+import sys
 import time
 import logging
-from typing import Dict, List
-from datetime import datetime
+import threading
+from array import array
+from collections import defaultdict
+from functools import partial
+from typing import Callable, Dict, List, Optional
 
 from .base import BaseMiddleware, AgentRequest, AgentResponse
+from ..utils.logger import flush_async_handlers
+
+
+# Per-agent section of print_summary()
+_AGENT_BLOCK = "\n".join((
+    "  %s:",
+    "    Calls:   %d",
+    "    Min:     %.2f ms",
+    "    Max:     %.2f ms",
+    "    Average: %.2f ms",
+    "    Total:   %.2f ms",
+))
+
+
+def _round_ms(stats: Dict[str, float]) -> Dict[str, float]:
+    """Round the millisecond figures of a stats dict to 2 decimals."""
+    return {
+        key: round(value, 2) if key.endswith("_ms") else value
+        for key, value in stats.items()
+    }
+
+
+class _MetricsShard:
+    """Per-thread metric accumulators, written without locking."""
+    
+    __slots__ = ("starts", "durations", "totals", "requests", "responses")
+    
+    def __init__(self):
+        self.starts: Dict[int, int] = {}  # request_id -> start time (ns)
+        # agent_name -> array('q') of durations (ns)
+        self.durations: Dict[str, array] = defaultdict(partial(array, "q"))
+        # agent_name -> running [count, sum, min, max] of durations (ns)
+        self.totals: Dict[str, List[int]] = defaultdict(lambda: [0, 0, sys.maxsize, 0])
+        self.requests = 0
+        self.responses = 0
 
 
 class MetricsMiddleware(BaseMiddleware):
@@ -21,6 +60,9 @@ class MetricsMiddleware(BaseMiddleware):
     Metrics can be retrieved and displayed at any time to analyze
     agent performance and identify bottlenecks.
     
+    Each thread records into its own shard, so concurrent agents never
+    contend on shared counters; shards are merged when metrics are read.
+    
     Example:
         metrics = MetricsMiddleware()
         # ... process requests ...
@@ -30,12 +72,73 @@ class MetricsMiddleware(BaseMiddleware):
     def __init__(self, logger: logging.Logger = None):
         """Initialize the metrics middleware with empty metric storage."""
         super().__init__("MetricsMiddleware")
-        self.request_times: Dict[int, float] = {}  # request_id -> start_time
-        self.agent_metrics: Dict[str, List[float]] = {}  # agent_name -> [durations]
-        self.total_requests = 0
-        self.total_responses = 0
+        self._local = threading.local()
+        self._shards: List[_MetricsShard] = []
+        self._shards_lock = threading.Lock()
         self.logger = logger or logging.getLogger(__name__)
     
+    def _shard(self) -> _MetricsShard:
+        """Return the calling thread's shard, registering it on first use."""
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = _MetricsShard()
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+    
+    @property
+    def request_times(self) -> Dict[int, float]:
+        """Start times (seconds) of requests still awaiting a response."""
+        merged: Dict[int, float] = {}
+        for shard in list(self._shards):
+            for request_id, start_ns in shard.starts.items():
+                merged[request_id] = start_ns / 1e9
+        return merged
+    
+    def _merged_durations(self) -> Dict[str, array]:
+        """Durations (ns) per agent, concatenated across thread shards."""
+        merged: Dict[str, array] = {}
+        for shard in list(self._shards):
+            for agent_name, durations in shard.durations.items():
+                if agent_name in merged:
+                    merged[agent_name] += durations
+                else:
+                    merged[agent_name] = array("q", durations)
+        return merged
+    
+    def _merged_totals(self) -> Dict[str, List[int]]:
+        """Running [count, sum, min, max] (ns) per agent, combined across shards."""
+        merged: Dict[str, List[int]] = {}
+        for shard in list(self._shards):
+            for agent_name, (count, total_ns, min_ns, max_ns) in list(shard.totals.items()):
+                totals = merged.get(agent_name)
+                if totals is None:
+                    merged[agent_name] = [count, total_ns, min_ns, max_ns]
+                else:
+                    totals[0] += count
+                    totals[1] += total_ns
+                    totals[2] = min(totals[2], min_ns)
+                    totals[3] = max(totals[3], max_ns)
+        return merged
+    
+    @property
+    def agent_metrics(self) -> Dict[str, List[float]]:
+        """Durations (seconds) per agent, merged across threads."""
+        return {
+            agent_name: [d / 1e9 for d in durations]
+            for agent_name, durations in self._merged_durations().items()
+        }
+    
+    @property
+    def total_requests(self) -> int:
+        return sum(shard.requests for shard in list(self._shards))
+    
+    @property
+    def total_responses(self) -> int:
+        return sum(shard.responses for shard in list(self._shards))
+    
     def process_request(self, request: AgentRequest) -> AgentRequest:
         """
         Record the start time of an agent request.
@@ -46,13 +149,11 @@ class MetricsMiddleware(BaseMiddleware):
         Returns:
             The unmodified request
         """
-        # Record start time for this request
-        self.request_times[request.request_id] = time.time()
-        self.total_requests += 1
+        shard = self._shard()
         
-        # Initialize metrics for this agent if needed
-        if request.agent_name not in self.agent_metrics:
-            self.agent_metrics[request.agent_name] = []
+        # Record start time for this request
+        shard.starts[request.request_id] = time.perf_counter_ns()
+        shard.requests += 1
         
         return request
     
@@ -66,25 +167,67 @@ class MetricsMiddleware(BaseMiddleware):
         Returns:
             The unmodified response with added timing metadata
         """
-        self.total_responses += 1
+        end_ns = time.perf_counter_ns()
+        shard = self._shard()
+        shard.responses += 1
+        
+        # The request may have started on another thread (e.g. an executor)
+        start_ns = shard.starts.pop(response.request_id, None)
+        if start_ns is None:
+            for other in list(self._shards):
+                start_ns = other.starts.pop(response.request_id, None)
+                if start_ns is not None:
+                    break
         
         # Calculate duration if we have a start time
-        if response.request_id in self.request_times:
-            start_time = self.request_times[response.request_id]
-            duration = time.time() - start_time
-            
-            # Store duration for this agent
-            if response.agent_name in self.agent_metrics:
-                self.agent_metrics[response.agent_name].append(duration)
-            
-            # Add timing info to response metadata
-            response.metadata["execution_time_ms"] = round(duration * 1000, 2)
-            
-            # Clean up to avoid memory leaks
-            del self.request_times[response.request_id]
+        if start_ns is not None:
+            self._record(shard, response, end_ns - start_ns)
+        
+        return response
+    
+    def __call__(
+        self,
+        request: AgentRequest,
+        next_: Callable[[AgentRequest], AgentResponse]
+    ) -> AgentResponse:
+        """
+        Time a wrapped agent call, keeping the start time on the stack.
         
+        Used by MiddlewareChain.wrap(); unlike the split request/response
+        path, no start-time entry is stored or looked up per request.
+        
+        Args:
+            request: The agent request to track
+            next_: Callable running the rest of the chain and the agent
+            
+        Returns:
+            The response with added timing metadata
+        """
+        shard = self._shard()
+        shard.requests += 1
+        start_ns = time.perf_counter_ns()
+        response = next_(request)
+        end_ns = time.perf_counter_ns()
+        shard.responses += 1
+        self._record(shard, response, end_ns - start_ns)
         return response
     
+    @staticmethod
+    def _record(shard: _MetricsShard, response: AgentResponse, duration_ns: int):
+        """Store one duration and annotate the response with it."""
+        # Store duration for this agent and update its running aggregates
+        shard.durations[response.agent_name].append(duration_ns)
+        totals = shard.totals[response.agent_name]
+        totals[0] += 1
+        totals[1] += duration_ns
+        if duration_ns < totals[2]:
+            totals[2] = duration_ns
+        if duration_ns > totals[3]:
+            totals[3] = duration_ns
+        
+        # Add timing info to response metadata
+        response.metadata["execution_time_ms"] = round(duration_ns / 1e6, 2)
+    
     def get_agent_stats(self, agent_name: str) -> Dict[str, float]:
         """
         Get statistics for a specific agent.
@@ -95,7 +238,18 @@ class MetricsMiddleware(BaseMiddleware):
         Returns:
             Dictionary with min, max, avg, and total time statistics
         """
-        if agent_name not in self.agent_metrics or not self.agent_metrics[agent_name]:
+        return _round_ms(self._agent_stats(self._merged_totals().get(agent_name)))
+    
+    @staticmethod
+    def _agent_stats(totals: Optional[List[int]]) -> Dict[str, float]:
+        """
+        Compute per-agent statistics in milliseconds.
+        
+        Everything comes from the running [count, sum, min, max]
+        aggregates, so no individual durations are read. Values are left
+        unrounded; get_agent_stats() and print_summary() round them.
+        """
+        if not totals or not totals[0]:
             return {
                 "count": 0,
                 "min_ms": 0,
@@ -104,15 +258,14 @@ class MetricsMiddleware(BaseMiddleware):
                 "total_ms": 0
             }
         
-        durations = self.agent_metrics[agent_name]
-        total_ms = sum(d * 1000 for d in durations)
+        count, total_ns, min_ns, max_ns = totals
         
         return {
-            "count": len(durations),
-            "min_ms": round(min(durations) * 1000, 2),
-            "max_ms": round(max(durations) * 1000, 2),
-            "avg_ms": round(total_ms / len(durations), 2),
-            "total_ms": round(total_ms, 2)
+            "count": count,
+            "min_ms": min_ns / 1e6,
+            "max_ms": max_ns / 1e6,
+            "avg_ms": total_ns / count / 1e6,
+            "total_ms": total_ns / 1e6
         }
     
     def get_total_stats(self) -> Dict[str, any]:
@@ -122,11 +275,17 @@ class MetricsMiddleware(BaseMiddleware):
         Returns:
             Dictionary with total requests, responses, and timing info
         """
-        all_durations = []
-        for durations in self.agent_metrics.values():
-            all_durations.extend(durations)
+        return _round_ms(self._total_stats(self._merged_totals()))
+    
+    def _total_stats(self, agent_totals: Dict[str, List[int]]) -> Dict[str, any]:
+        """Compute overall statistics from merged per-agent running aggregates."""
+        count = 0
+        total_ns = 0
+        for totals in agent_totals.values():
+            count += totals[0]
+            total_ns += totals[1]
         
-        if not all_durations:
+        if not count:
             return {
                 "total_requests": self.total_requests,
                 "total_responses": self.total_responses,
@@ -134,13 +293,11 @@ class MetricsMiddleware(BaseMiddleware):
                 "avg_time_ms": 0
             }
         
-        total_ms = sum(d * 1000 for d in all_durations)
-        
         return {
             "total_requests": self.total_requests,
             "total_responses": self.total_responses,
-            "total_time_ms": round(total_ms, 2),
-            "avg_time_ms": round(total_ms / len(all_durations), 2)
+            "total_time_ms": total_ns / 1e6,
+            "avg_time_ms": total_ns / count / 1e6
         }
     
     def print_summary(self):
@@ -152,36 +309,40 @@ class MetricsMiddleware(BaseMiddleware):
         - Overall statistics
         - Performance insights
         """
-        self.logger.info("=" * 60)
-        self.logger.info("METRICS SUMMARY")
-        self.logger.info("=" * 60)
+        # Let batched request/response logs land before the summary
+        flush_async_handlers()
+        
+        # Merge the thread shards once for both the overall and per-agent passes
+        agent_totals = self._merged_totals()
+        
+        # Build the whole report and emit it as one log record
+        rule = "=" * 60
+        lines = [rule, "METRICS SUMMARY", rule]
         
         # Overall stats
-        total_stats = self.get_total_stats()
-        self.logger.info("Overall Statistics:")
-        self.logger.info(f"  Total Requests:  {total_stats['total_requests']}")
-        self.logger.info(f"  Total Responses: {total_stats['total_responses']}")
-        self.logger.info(f"  Total Time:      {total_stats['total_time_ms']:.2f} ms")
-        self.logger.info(f"  Average Time:    {total_stats['avg_time_ms']:.2f} ms")
+        total_stats = self._total_stats(agent_totals)
+        lines.append("Overall Statistics:")
+        lines.append("  Total Requests:  %d" % total_stats["total_requests"])
+        lines.append("  Total Responses: %d" % total_stats["total_responses"])
+        lines.append("  Total Time:      %.2f ms" % total_stats["total_time_ms"])
+        lines.append("  Average Time:    %.2f ms" % total_stats["avg_time_ms"])
         
         # Per-agent stats
-        if self.agent_metrics:
-            self.logger.info("Per-Agent Statistics:")
-            for agent_name in sorted(self.agent_metrics.keys()):
-                stats = self.get_agent_stats(agent_name)
+        if agent_totals:
+            lines.append("Per-Agent Statistics:")
+            for agent_name in sorted(agent_totals.keys()):
+                stats = self._agent_stats(agent_totals[agent_name])
                 if stats['count'] > 0:
-                    self.logger.info(f"  {agent_name}:")
-                    self.logger.info(f"    Calls:   {stats['count']}")
-                    self.logger.info(f"    Min:     {stats['min_ms']:.2f} ms")
-                    self.logger.info(f"    Max:     {stats['max_ms']:.2f} ms")
-                    self.logger.info(f"    Average: {stats['avg_ms']:.2f} ms")
-                    self.logger.info(f"    Total:   {stats['total_ms']:.2f} ms")
+                    lines.append(_AGENT_BLOCK % (
+                        agent_name, stats["count"], stats["min_ms"], stats["max_ms"],
+                        stats["avg_ms"], stats["total_ms"]
+                    ))
         
-        self.logger.info("=" * 60)
+        lines.append(rule)
+        self.logger.info("\n".join(lines))
     
     def reset(self):
         """Reset all metrics to initial state."""
-        self.request_times.clear()
-        self.agent_metrics.clear()
-        self.total_requests = 0
-        self.total_responses = 0
+        with self._shards_lock:
+            self._shards = []
+        self._local = threading.local()
@@ -1,8 +1,10 @@
 """Command execution tool for running shell commands safely."""
 
+import os
 import subprocess
 import shlex
-from typing import Optional
+import signal
+from typing import Any, Dict, Hashable, Optional
 
 from .mcp_base import MCPTool
 
@@ -30,18 +32,84 @@ class CommandTool(MCPTool):
     name = "execute_command"
     description = "Execute shell commands and return their output"
     
-    def __init__(self, timeout: int = 30, allowed_commands: Optional[list] = None):
+    # Results of the commands listed in CACHE_TTLS are memoized by run()
+    deterministic = True
+    
+    # Seconds a successful result stays cached, by command name.
+    # Commands not listed here (e.g. date) always run.
+    CACHE_TTLS: Dict[str, float] = {
+        "echo": float("inf"),
+        "pwd": float("inf"),
+        "uname": 3600.0,
+        "whoami": 3600.0,
+    }
+    
+    # Shell syntax whose output may depend on more than the command text;
+    # a line break starts another command, as ";" does
+    _UNCACHEABLE_CHARS = frozenset("$`|;&<>*?(\n\r")
+    
+    def __init__(
+        self,
+        timeout: int = 30,
+        allowed_commands: Optional[list] = None,
+        cache_size: int = 128
+    ):
         """
         Initialize the command tool.
         
         Args:
             timeout: Default timeout in seconds for command execution
             allowed_commands: Optional list of allowed command prefixes for security
+            cache_size: Maximum number of cached command results (0 disables caching)
         """
-        super().__init__()
+        super().__init__(cache_size=cache_size)
         self.default_timeout = timeout
         self.allowed_commands = allowed_commands
     
+    @property
+    def allowed_commands(self) -> Optional[list]:
+        """Allowed command prefixes, or None for no restriction."""
+        return self._allowed_commands
+    
+    @allowed_commands.setter
+    def allowed_commands(self, allowed_commands: Optional[list]):
+        self._allowed_commands = allowed_commands
+        # str.startswith checks a tuple of prefixes in a single C-level call
+        self._allowed_prefixes = (
+            tuple(allowed_commands) if allowed_commands is not None else None
+        )
+    
+    def _cache_ttl(self, kwargs: Dict[str, Any]) -> float:
+        """
+        Get how long the result of a command may be cached.
+        
+        Args:
+            kwargs: Arguments passed to run()
+            
+        Returns:
+            TTL in seconds (0 means do not cache)
+        """
+        command = kwargs.get("command")
+        if not command or not command.strip():
+            return 0.0
+        if not self._UNCACHEABLE_CHARS.isdisjoint(command):
+            return 0.0
+        return self.CACHE_TTLS.get(command.split()[0], 0.0)
+    
+    def _cache_key(self, kwargs: Dict[str, Any]) -> Optional[Hashable]:
+        """
+        Key cacheable commands on the command and working directory.
+        
+        Args:
+            kwargs: Arguments passed to run()
+            
+        Returns:
+            Cache key, or None if the command should always run
+        """
+        if kwargs.keys() <= {"command"} and self._cache_ttl(kwargs):
+            return (kwargs["command"], os.getcwd())
+        return None
+    
     def _is_command_allowed(self, command: str) -> bool:
         """
         Check if a command is allowed to execute.
@@ -52,16 +120,14 @@ class CommandTool(MCPTool):
         Returns:
             True if command is allowed, False otherwise
         """
-        if self.allowed_commands is None:
+        if self._allowed_prefixes is None:
             # No restrictions if allowed_commands is not set
             return True
         
         # Check if command starts with any allowed prefix
-        command_base = command.split()[0] if command.strip() else ""
-        return any(
-            command_base.startswith(allowed)
-            for allowed in self.allowed_commands
-        )
+        words = command.split(None, 1)
+        command_base = words[0] if words else ""
+        return command_base.startswith(self._allowed_prefixes)
     
     def _run(
         self,
@@ -82,8 +148,8 @@ class CommandTool(MCPTool):
             
         Raises:
             ValueError: If command is not allowed
-            subprocess.TimeoutExpired: If command exceeds timeout
-            subprocess.CalledProcessError: If command returns non-zero exit code
+            TimeoutError: If command exceeds timeout
+            RuntimeError: If command returns non-zero exit code
         """
         if not command or not command.strip():
             raise ValueError("Command cannot be empty")
@@ -98,35 +164,56 @@ class CommandTool(MCPTool):
         # Use provided timeout or default
         exec_timeout = timeout if timeout is not None else self.default_timeout
         
-        try:
-            # Execute command with timeout
-            result = subprocess.run(
-                command,
-                shell=shell,
-                capture_output=True,
-                text=True,
-                timeout=exec_timeout,
-                check=True
-            )
-            
-            # Combine stdout and stderr
-            output = result.stdout
-            if result.stderr:
-                output += f"\n[stderr]: {result.stderr}"
-            
-            return output.strip() if output else "(no output)"
+        # Run the command in its own process group so a timeout can kill
+        # everything it spawned; otherwise a grandchild holding the pipes
+        # open would keep the caller blocked long after the timeout
+        proc = subprocess.Popen(
+            command,
+            shell=shell,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            start_new_session=(os.name == "posix")
+        )
         
-        except subprocess.TimeoutExpired:
-            raise TimeoutError(
-                f"Command timed out after {exec_timeout} seconds: {command}"
-            )
+        with proc:
+            try:
+                stdout, stderr = proc.communicate(timeout=exec_timeout)
+            except subprocess.TimeoutExpired:
+                self._kill(proc)
+                proc.communicate()
+                raise TimeoutError(
+                    f"Command timed out after {exec_timeout} seconds: {command}"
+                )
+            except BaseException:
+                # e.g. KeyboardInterrupt: the child is in its own session, so
+                # Ctrl-C never reached it; don't leave it running orphaned
+                self._kill(proc)
+                proc.wait()
+                raise
         
-        except subprocess.CalledProcessError as e:
+        if proc.returncode != 0:
             # Include error output in exception message
-            error_msg = f"Command failed with exit code {e.returncode}: {command}"
-            if e.stderr:
-                error_msg += f"\n{e.stderr}"
+            error_msg = f"Command failed with exit code {proc.returncode}: {command}"
+            if stderr:
+                error_msg += f"\n{stderr}"
             raise RuntimeError(error_msg)
+        
+        # Combine stdout and stderr in one join rather than growing a copy
+        output = "\n[stderr]: ".join((stdout, stderr)) if stderr else stdout
+        
+        return output.strip() if output else "(no output)"
+    
+    @staticmethod
+    def _kill(proc: subprocess.Popen):
+        """Kill a command started by _run along with any processes it spawned."""
+        if os.name == "posix":
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+                return
+            except OSError:
+                pass
+        proc.kill()
     
     def run_safe(self, command: str, **kwargs) -> dict:
         """
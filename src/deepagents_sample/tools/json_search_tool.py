@@ -1,11 +1,96 @@
 """JSON search tool using jq for querying JSON data."""
 
+import hashlib
 import json
+import os
+import re
+import select
+import stat
 import subprocess
+import threading
+from collections import OrderedDict, deque
+from dataclasses import replace
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Union
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 
-from .mcp_base import MCPTool
+from .mcp_base import MCPTool, MCPToolResponse
+
+try:
+    # Optional libjq bindings: run queries in-process instead of spawning jq
+    import jq as _jq
+except ImportError:
+    _jq = None
+else:
+    # Compiling a jq program is the expensive part of an in-process query
+    _compile_jq = lru_cache(maxsize=256)(_jq.compile)
+
+try:
+    # Optional faster parser; installed alongside langsmith on CPython
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+def _parse_json(content: Union[str, bytes]) -> Any:
+    """
+    Parse JSON text, with orjson when it is available.
+    
+    Documents orjson rejects but the stdlib accepts (integers wider than
+    64 bits, NaN/Infinity literals) are retried with json.loads, which
+    also raises json.JSONDecodeError for genuinely invalid input.
+    """
+    if _orjson is not None:
+        try:
+            return _orjson.loads(content)
+        except _orjson.JSONDecodeError:
+            pass
+    return json.loads(content)
+
+
+@lru_cache(maxsize=None)
+def _jq_version() -> Optional[str]:
+    """
+    Probe the jq binary on PATH, once per process.
+    
+    Returns:
+        Output of `jq --version`, or None if jq is missing or broken
+    """
+    try:
+        result = subprocess.run(
+            ["jq", "--version"],
+            capture_output=True,
+            text=True,
+            timeout=5
+        )
+    except (subprocess.SubprocessError, OSError):
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def default_disk_cache_dir() -> Path:
+    """
+    Per-user directory for JSONSearchTool's persistent result cache.
+    
+    Returns:
+        $XDG_CACHE_HOME/deepagents/jq, defaulting to ~/.cache/deepagents/jq
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base, "deepagents", "jq")
+
+
+# One part of a plain get_field() path: an identifier or an array index
+_FIELD_TOKEN_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|[0-9]+")
+
+
+def _file_stat(source: Union[str, Path]) -> Optional[os.stat_result]:
+    """Stat a source with one syscall, returning None unless it is a regular file."""
+    try:
+        st = os.stat(source)
+    except (OSError, TypeError, ValueError):
+        # Not a path at all (e.g. a JSON string too long or containing NUL)
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
 
 
 class JSONSearchTool(MCPTool):
@@ -24,6 +109,16 @@ class JSONSearchTool(MCPTool):
     - '.projects | length' - Count projects
     - '.users[].name' - Extract all user names
     
+    When the optional `jq` Python package (libjq bindings) is installed,
+    queries run in-process against a cached parse of each file; otherwise
+    each distinct query gets a long-lived jq process that documents are
+    piped through, so repeated queries do not pay for a fork/exec.
+    Responses are memoized per (file, modification time, size, query), so
+    repeating a query against an unchanged file skips jq entirely; treat
+    returned results as read-only. With disk_cache_dir set, results of file
+    queries are also stored on disk keyed by the file's SHA-256 and the
+    query, so they survive process restarts.
+    
     Example:
         tool = JSONSearchTool()
         response = tool.run(
@@ -35,15 +130,54 @@ class JSONSearchTool(MCPTool):
     
     name = "search_json"
     description = "Search and query JSON files using jq syntax"
+    deterministic = True
     
-    def __init__(self, check_jq: bool = True):
+    # Files at least this large are streamed straight into a one-shot jq
+    # process instead of being read into memory, even when the libjq
+    # bindings are installed (the jq executable must be on PATH)
+    STREAM_MIN_BYTES = 8 * 1024 * 1024
+    
+    # Buffer size for the coprocess pipes; large documents and result
+    # lines then move in a few big reads/writes instead of 8 KiB steps
+    PIPE_BUFFER_SIZE = 64 * 1024
+    
+    # Trailing lines of a coprocess's stderr kept for error messages
+    STDERR_TAIL_LINES = 50
+    
+    def __init__(
+        self,
+        check_jq: bool = True,
+        max_processes: int = 16,
+        cache_size: int = 512,
+        disk_cache_dir: Optional[Union[str, Path]] = None
+    ):
         """
         Initialize the JSON search tool.
         
         Args:
             check_jq: Whether to check if jq is installed on initialization
+            max_processes: Maximum number of jq processes kept alive when
+                the jq executable is used (one per distinct query)
+            cache_size: Maximum number of memoized responses, and of files
+                whose text, parse and digest are kept (0 disables caching)
+            disk_cache_dir: Optional directory for results of file queries
+                that persists across processes (see default_disk_cache_dir())
         """
-        super().__init__()
+        super().__init__(cache_size=cache_size)
+        
+        self.disk_cache_dir = Path(disk_cache_dir) if disk_cache_dir is not None else None
+        # Per-file caches, each holding at most cache_size files (LRU):
+        # file path -> (mtime_ns, size, sha256 hex digest of the contents)
+        self._digests: "OrderedDict[str, Tuple[int, int, str]]" = OrderedDict()
+        # file path -> (mtime_ns, size, parsed data)
+        self._parsed: "OrderedDict[str, Tuple[int, int, Any]]" = OrderedDict()
+        # file path -> (mtime_ns, size, raw JSON text)
+        self._texts: "OrderedDict[str, Tuple[int, int, str]]" = OrderedDict()
+        
+        # jq query -> running `jq` process fed one document per request
+        self._processes: "OrderedDict[str, subprocess.Popen]" = OrderedDict()
+        self._processes_lock = threading.Lock()
+        self.max_processes = max_processes
         
         if check_jq:
             self._check_jq_installed()
@@ -58,28 +192,44 @@ class JSONSearchTool(MCPTool):
         Raises:
             RuntimeError: If jq is not installed
         """
-        try:
-            result = subprocess.run(
-                ["jq", "--version"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except (subprocess.SubprocessError, FileNotFoundError):
-            raise RuntimeError(
-                "jq is not installed. Please install it:\n"
-                "  macOS: brew install jq\n"
-                "  Ubuntu/Debian: sudo apt-get install jq\n"
-                "  Windows: choco install jq"
-            )
+        if _jq is not None or _jq_version() is not None:
+            return True
+        
+        raise RuntimeError(
+            "jq is not installed. Please install it:\n"
+            "  macOS: brew install jq\n"
+            "  Ubuntu/Debian: sudo apt-get install jq\n"
+            "  Windows: choco install jq"
+        )
+    
+    def _file_cache_get(
+        self, cache: "OrderedDict[str, Tuple[int, int, Any]]", key: str, st: os.stat_result
+    ) -> Optional[Tuple[int, int, Any]]:
+        """Get a per-file cache entry, or None if the file changed since it was stored."""
+        with self._cache_lock:
+            entry = cache.get(key)
+            if entry is None or entry[0] != st.st_mtime_ns or entry[1] != st.st_size:
+                return None
+            cache.move_to_end(key)
+            return entry
     
-    def _load_json(self, source: Union[str, Path]) -> str:
+    def _file_cache_put(
+        self, cache: "OrderedDict[str, Tuple[int, int, Any]]", key: str, st: os.stat_result, value: Any
+    ):
+        """Store a per-file cache entry, evicting the least recently used files."""
+        with self._cache_lock:
+            cache[key] = (st.st_mtime_ns, st.st_size, value)
+            cache.move_to_end(key)
+            while len(cache) > self.cache_size:
+                cache.popitem(last=False)
+    
+    def _load_json(self, source: Union[str, Path], st: Optional[os.stat_result] = None) -> str:
         """
         Load JSON data from a file or string.
         
         Args:
             source: File path or JSON string
+            st: Result of _file_stat(source), if the caller already has it
             
         Returns:
             JSON string
@@ -88,24 +238,95 @@ class JSONSearchTool(MCPTool):
             FileNotFoundError: If file doesn't exist
             json.JSONDecodeError: If JSON is invalid
         """
-        # Check if it's a file path
-        path = Path(source)
-        if path.exists() and path.is_file():
-            with open(path, 'r') as f:
+        # Check if it's a file path; unchanged files are not re-read
+        if st is None:
+            st = _file_stat(source)
+        if st is not None:
+            key = os.fspath(source)
+            cached = self._file_cache_get(self._texts, key, st)
+            if cached is not None:
+                return cached[2]
+            
+            with open(source, 'r') as f:
                 content = f.read()
                 # Validate JSON
-                json.loads(content)
-                return content
+                _parse_json(content)
+            self._file_cache_put(self._texts, key, st, content)
+            return content
         
         # Try to parse as JSON string
         try:
-            json.loads(source)
+            _parse_json(source)
             return source
         except json.JSONDecodeError:
             raise ValueError(
                 f"Source is neither a valid file path nor valid JSON: {source}"
             )
     
+    def _load_parsed(self, source: Union[str, Path], st: Optional[os.stat_result] = None) -> Any:
+        """
+        Load and parse JSON data from a file or string, caching parsed files.
+        
+        Parsed files are reused until their modification time or size
+        changes; at most cache_size files are kept.
+        
+        Args:
+            source: File path or JSON string
+            st: Result of _file_stat(source), if the caller already has it
+            
+        Returns:
+            Parsed JSON data
+            
+        Raises:
+            ValueError: If source is neither a file nor valid JSON
+        """
+        if st is None:
+            st = _file_stat(source)
+        if st is not None:
+            key = os.fspath(source)
+            cached = self._file_cache_get(self._parsed, key, st)
+            if cached is not None:
+                return cached[2]
+            
+            with open(source, 'rb') as f:
+                data = _parse_json(f.read())
+            self._file_cache_put(self._parsed, key, st, data)
+            return data
+        
+        try:
+            return _parse_json(source)
+        except json.JSONDecodeError:
+            raise ValueError(
+                f"Source is neither a valid file path nor valid JSON: {source}"
+            )
+    
+    @staticmethod
+    def _format_outputs(outputs: List[Any]) -> Any:
+        """
+        Shape in-process jq outputs like parsed jq CLI output.
+        
+        A single output is returned as-is, no output as None, and multiple
+        outputs as the newline-separated text the jq CLI would print.
+        """
+        if not outputs:
+            return None
+        if len(outputs) == 1:
+            return outputs[0]
+        return "\n".join(json.dumps(value, indent=2) for value in outputs)
+    
+    def _run_in_process(
+        self, source: Union[str, Path], jq_query: str, st: Optional[os.stat_result] = None
+    ) -> Any:
+        """Execute a jq query with the libjq bindings."""
+        data = self._load_parsed(source, st)
+        
+        try:
+            outputs = _compile_jq(jq_query).input_value(data).all()
+        except ValueError as e:
+            raise RuntimeError(f"jq query failed: {jq_query}\n{e}")
+        
+        return self._format_outputs(outputs)
+    
     def _run(
         self,
         file_path: str = None,
@@ -133,42 +354,270 @@ class JSONSearchTool(MCPTool):
         if not jq_query or not jq_query.strip():
             jq_query = "."
         
-        # Load JSON data
-        if file_path:
-            json_string = self._load_json(file_path)
+        # One stat per query, shared by the disk cache, streaming and loading
+        source = file_path or json_data
+        st = _file_stat(source)
+        
+        disk_path = None
+        if file_path and st is not None and self.disk_cache_dir is not None:
+            disk_path = self._disk_cache_path(file_path, jq_query, st)
+            if disk_path is not None:
+                try:
+                    with open(disk_path, 'rb') as f:
+                        return _parse_json(f.read())
+                except (OSError, ValueError):
+                    pass
+        
+        if file_path and self._should_stream(st):
+            result = self._run_streamed(file_path, jq_query)
+        elif _jq is not None:
+            result = self._run_in_process(source, jq_query, st)
         else:
-            json_string = self._load_json(json_data)
+            result = self._run_coprocess(self._load_json(source, st), jq_query)
         
-        try:
-            # Execute jq query
-            result = subprocess.run(
-                ["jq", jq_query],
-                input=json_string,
-                capture_output=True,
-                text=True,
-                timeout=30,
-                check=True
-            )
-            
-            # Parse jq output back to Python object
-            output = result.stdout.strip()
-            if not output:
-                return None
+        if disk_path is not None:
+            self._write_disk_cache(disk_path, result)
+        return result
+    
+    def _file_digest(self, file_path: str, st: os.stat_result) -> Optional[str]:
+        """
+        SHA-256 of a file's contents, rehashed only when its mtime or size changes.
+        
+        Args:
+            file_path: Path to a regular file
+            st: Result of _file_stat(file_path)
             
+        Returns:
+            Hex digest, or None if the file can't be read
+        """
+        
+        key = os.fspath(file_path)
+        cached = self._file_cache_get(self._digests, key, st)
+        if cached is not None:
+            return cached[2]
+        
+        digest = hashlib.sha256()
+        try:
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+        except OSError:
+            return None
+        
+        hex_digest = digest.hexdigest()
+        self._file_cache_put(self._digests, key, st, hex_digest)
+        return hex_digest
+    
+    def _disk_cache_path(
+        self, file_path: str, jq_query: str, st: os.stat_result
+    ) -> Optional[Path]:
+        """Path of the on-disk result for a query, keyed by file content and query."""
+        file_digest = self._file_digest(file_path, st)
+        if file_digest is None:
+            return None
+        key = hashlib.sha256(f"{file_digest}\0{jq_query}".encode()).hexdigest()
+        return self.disk_cache_dir / f"{key}.json"
+    
+    @staticmethod
+    def _write_disk_cache(path: Path, result: Any):
+        """Atomically store a result; failures only cost a future cache miss."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump(result, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError):
+            pass
+    
+    def _cache_key(self, kwargs: Dict[str, Any]) -> Optional[tuple]:
+        """
+        Build the response-cache key for a query against a file or JSON string.
+        
+        Files are identified by path, modification time and size, so an
+        edited file is queried afresh; JSON strings by a digest of their text.
+        """
+        if not kwargs.keys() <= {"file_path", "json_data", "jq_query"}:
+            return None
+        source = kwargs.get("file_path") or kwargs.get("json_data")
+        if not source:
+            return None
+        jq_query = kwargs.get("jq_query")
+        if not jq_query or not jq_query.strip():
+            jq_query = "."
+        
+        st = _file_stat(source)
+        if st is None:
+            digest = hashlib.blake2b(str(source).encode(), digest_size=16).digest()
+            return (digest, jq_query)
+        return (str(source), st.st_mtime_ns, st.st_size, jq_query)
+    
+    def _should_stream(self, st: Optional[os.stat_result]) -> bool:
+        """
+        Whether a file is large enough to stream into jq rather than load.
+        
+        Args:
+            st: Result of _file_stat() for the file (None if it isn't one)
+        """
+        if st is None or st.st_size < self.STREAM_MIN_BYTES:
+            return False
+        # With libjq the executable is optional; without it, load the file
+        return _jq is None or _jq_version() is not None
+    
+    def _run_streamed(self, file_path: str, jq_query: str, timeout: float = 30) -> Any:
+        """
+        Run a query with the file itself as jq's stdin.
+        
+        The file is never read into Python, so memory stays flat however
+        large it is; jq validates the JSON as it parses it.
+        """
+        with open(file_path, 'rb') as f:
             try:
-                return json.loads(output)
-            except json.JSONDecodeError:
-                # If output is not valid JSON (e.g., plain string), return as-is
-                return output
+                result = subprocess.run(
+                    ["jq", "-c", f"[{jq_query}]"],
+                    stdin=f,
+                    capture_output=True,
+                    timeout=timeout
+                )
+            except subprocess.TimeoutExpired:
+                raise TimeoutError(f"jq query timed out: {jq_query}")
         
-        except subprocess.CalledProcessError as e:
+        if result.returncode != 0:
             error_msg = f"jq query failed: {jq_query}"
-            if e.stderr:
-                error_msg += f"\n{e.stderr}"
+            if result.stderr:
+                error_msg += f"\n{result.stderr.decode(errors='replace')}"
             raise RuntimeError(error_msg)
         
+        # One output line per JSON document in the file
+        outputs: List[Any] = []
+        for line in result.stdout.splitlines():
+            outputs.extend(_parse_json(line))
+        return self._format_outputs(outputs)
+    
+    def _coprocess(self, jq_query: str) -> subprocess.Popen:
+        """
+        Get the long-lived jq process for a query, starting it if needed.
+        
+        The query is wrapped so every input document yields exactly one
+        output line: {"ok": [outputs...]} or {"error": message}.
+        """
+        proc = self._processes.get(jq_query)
+        if proc is not None and proc.poll() is None:
+            self._processes.move_to_end(jq_query)
+            return proc
+        
+        if len(self._processes) >= self.max_processes:
+            _, oldest = self._processes.popitem(last=False)
+            self._stop_process(oldest)
+        
+        proc = subprocess.Popen(
+            ["jq", "--unbuffered", "-c", f"try {{ok: [{jq_query}]}} catch {{error: .}}"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=self.PIPE_BUFFER_SIZE
+        )
+        # Drain stderr (debug/stderr output, compile errors) on a thread so
+        # a chatty query can't fill the pipe and stall jq; only the last
+        # lines are kept, for the error message if the process dies
+        proc.stderr_tail = deque(maxlen=self.STDERR_TAIL_LINES)
+        proc.stderr_reader = threading.Thread(
+            target=self._drain_stderr,
+            args=(proc.stderr, proc.stderr_tail),
+            daemon=True
+        )
+        proc.stderr_reader.start()
+        self._processes[jq_query] = proc
+        return proc
+    
+    @staticmethod
+    def _drain_stderr(stream, tail: deque):
+        """Read a coprocess's stderr until EOF, keeping the last lines in tail."""
+        try:
+            for line in stream:
+                tail.append(line)
+        except (OSError, ValueError):
+            # Stream closed under us by _stop_process
+            pass
+    
+    def _run_coprocess(self, json_string: str, jq_query: str, timeout: float = 30) -> Any:
+        """Pipe one JSON document through the query's jq process."""
+        with self._processes_lock:
+            proc = self._coprocess(jq_query)
+            
+            try:
+                proc.stdin.write(json_string)
+                proc.stdin.write("\n")
+                proc.stdin.flush()
+                
+                if os.name == "posix":
+                    ready, _, _ = select.select([proc.stdout], [], [], timeout)
+                    if not ready:
+                        self._processes.pop(jq_query, None)
+                        self._stop_process(proc)
+                        raise TimeoutError(f"jq query timed out: {jq_query}")
+                
+                line = proc.stdout.readline()
+            except (BrokenPipeError, OSError):
+                line = ""
+            
+            if not line:
+                # jq exited, e.g. because the query failed to compile
+                self._processes.pop(jq_query, None)
+                self._stop_process(proc)
+                stderr = "".join(proc.stderr_tail).strip()
+                error_msg = f"jq query failed: {jq_query}"
+                if stderr:
+                    error_msg += f"\n{stderr}"
+                raise RuntimeError(error_msg)
+        
+        output = _parse_json(line)
+        if "error" in output:
+            raise RuntimeError(f"jq query failed: {jq_query}\n{output['error']}")
+        
+        return self._format_outputs(output["ok"])
+    
+    @staticmethod
+    def _stop_process(proc: subprocess.Popen):
+        """Close a jq process's pipes and wait for it to exit."""
+        try:
+            # EOF on stdin makes jq exit once it has finished its input
+            proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            proc.wait(timeout=1)
         except subprocess.TimeoutExpired:
-            raise TimeoutError(f"jq query timed out: {jq_query}")
+            proc.kill()
+            proc.wait()
+        # The process is gone, so the reader sees EOF and finishes its tail
+        proc.stderr_reader.join(timeout=1)
+        for stream in (proc.stdout, proc.stderr):
+            try:
+                stream.close()
+            except OSError:
+                pass
+    
+    def clear_cache(self):
+        """
+        Drop all memoized responses and cached file contents.
+        
+        Results stored in disk_cache_dir are left in place; they are keyed
+        by file content, so they can't go stale.
+        """
+        super().clear_cache()
+        with self._cache_lock:
+            self._digests.clear()
+            self._parsed.clear()
+            self._texts.clear()
+    
+    def close(self):
+        """Stop any jq processes kept alive by this tool."""
+        with self._processes_lock:
+            while self._processes:
+                _, proc = self._processes.popitem()
+                self._stop_process(proc)
     
     def query_file(self, file_path: str, query: str) -> dict:
         """
@@ -190,22 +639,96 @@ class JSONSearchTool(MCPTool):
             "execution_time": response.execution_time
         }
     
+    def query_many(
+        self,
+        file_path: str,
+        queries: Union[Mapping[str, str], Iterable[Tuple[str, str]]]
+    ) -> MCPToolResponse:
+        """
+        Run several named queries against a file in a single jq execution.
+        
+        The queries are merged into one jq program that builds an object
+        keyed by name, so the file is read and parsed once for the whole
+        batch. Each query's outputs are collected and shaped the same way
+        as a single run() would shape them.
+        
+        Args:
+            file_path: Path to JSON file
+            queries: Mapping of name -> jq query expression, or an
+                iterable of (name, query) pairs
+            
+        Returns:
+            MCPToolResponse whose result maps each name to its query result.
+            If any query fails, the whole batch fails.
+            
+        Raises:
+            ValueError: If two queries share a name
+        """
+        pairs = list(queries.items() if isinstance(queries, Mapping) else queries)
+        names = set()
+        for name, _ in pairs:
+            if name in names:
+                raise ValueError(f"Duplicate query name: {name!r}")
+            names.add(name)
+        
+        program = "{" + ", ".join(
+            f"{json.dumps(name)}: [{query}]" for name, query in pairs
+        ) + "}"
+        
+        response = self.run(file_path=file_path, jq_query=program)
+        if not response.success:
+            return response
+        # Copy rather than mutate: the original may be memoized by run()
+        return replace(response, result={
+            name: self._format_outputs(outputs)
+            for name, outputs in response.result.items()
+        })
+    
     def get_field(self, file_path: str, field_path: str) -> Any:
         """
         Extract a specific field from a JSON file.
         
         Args:
             file_path: Path to JSON file
-            field_path: Dot-notation path (e.g., "users.0.name")
+            field_path: Dot-notation path (e.g., "users.0.name"); numeric
+                parts index into arrays
             
         Returns:
-            Field value
+            Field value (None if a key or index is missing, as in jq)
+            
+        Raises:
+            RuntimeError: If the file can't be read or the path doesn't fit the data
         """
-        # Convert dot notation to jq syntax
-        jq_query = "." + field_path.replace(".", ".")
+        tokens = field_path.split(".")
+        if all(_FIELD_TOKEN_RE.fullmatch(token) for token in tokens):
+            # Plain key/index path: walk the cached parse, no jq needed
+            try:
+                return self._walk_fields(self._load_parsed(file_path), tokens)
+            except (ValueError, TypeError) as e:
+                raise RuntimeError(f"Failed to get field: {e}")
+        
+        # Anything else is handed to jq as written
+        jq_query = "." + field_path
         response = self.run(file_path=file_path, jq_query=jq_query)
         
         if response.success:
             return response.result
         else:
             raise RuntimeError(f"Failed to get field: {response.error}")
+    
+    @staticmethod
+    def _walk_fields(data: Any, tokens: List[str]) -> Any:
+        """Follow dot-path tokens through parsed JSON with jq's null semantics."""
+        for token in tokens:
+            if data is None:
+                return None
+            if isinstance(data, dict):
+                data = data.get(token)
+            elif isinstance(data, list) and token.isdigit():
+                index = int(token)
+                data = data[index] if index < len(data) else None
+            else:
+                raise TypeError(
+                    f"Cannot index {type(data).__name__} with {token!r}"
+                )
+        return data
@@ -1,35 +1,56 @@
 """Base classes for MCP (Model Context Protocol) tool integration."""
 
+import hashlib
+import threading
 import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
-from pydantic import BaseModel, Field
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Hashable, Optional, Tuple
 
 
-class MCPToolRequest(BaseModel):
+@dataclass(slots=True)
+class MCPToolRequest:
     """
     Request format for MCP tools.
     
     Standardizes how tools receive parameters and configuration.
+    
+    Attributes:
+        tool_name: Name of the tool to invoke
+        parameters: Tool parameters
+        timeout: Timeout in seconds
+        metadata: Additional metadata
     """
-    tool_name: str = Field(description="Name of the tool to invoke")
-    parameters: Dict[str, Any] = Field(default_factory=dict, description="Tool parameters")
-    timeout: int = Field(default=30, description="Timeout in seconds")
-    metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
+    tool_name: str
+    parameters: Dict[str, Any] = field(default_factory=dict)
+    timeout: int = 30
+    metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-class MCPToolResponse(BaseModel):
+@dataclass(slots=True)
+class MCPToolResponse:
     """
     Response format from MCP tools.
     
     Provides consistent structure for tool results, including
     success status, result data, error information, and timing.
+    A plain slotted dataclass rather than a pydantic model, since one
+    is built for every tool call; pydantic can still validate or export
+    a schema for it (e.g. via TypeAdapter) at API boundaries.
+    
+    Attributes:
+        success: Whether the tool execution succeeded
+        execution_time: Execution time in seconds
+        result: Tool execution result
+        error: Error message if failed
+        metadata: Additional metadata
     """
-    success: bool = Field(description="Whether the tool execution succeeded")
-    result: Any = Field(default=None, description="Tool execution result")
-    error: Optional[str] = Field(default=None, description="Error message if failed")
-    execution_time: float = Field(description="Execution time in seconds")
-    metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
+    success: bool
+    execution_time: float
+    result: Any = None
+    error: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
 
 
 class MCPTool(ABC):
@@ -44,7 +65,9 @@ class MCPTool(ABC):
     
     Each tool must implement the _run method with its specific logic.
     The base class handles common concerns like timing, error handling,
-    and response formatting.
+    and response formatting. Tools whose output depends only on their
+    arguments can set `deterministic = True` to have successful responses
+    memoized (see _cache_key and _cache_ttl).
     
     Example:
         class MyTool(MCPTool):
@@ -59,10 +82,25 @@ class MCPTool(ABC):
     name: str = "base_tool"
     description: str = "Base MCP tool"
     
-    def __init__(self):
-        """Initialize the MCP tool."""
+    # Whether run() may serve repeated calls from the response cache
+    deterministic: bool = False
+    
+    def __init__(self, cache_size: int = 1024):
+        """
+        Initialize the MCP tool.
+        
+        Args:
+            cache_size: Maximum number of memoized responses for
+                deterministic tools (0 disables caching)
+        """
         self.call_count = 0
-        self.total_execution_time = 0.0
+        self.total_execution_time_ns = 0
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        # key -> (expiry on the perf_counter_ns clock, response)
+        self._response_cache: "OrderedDict[Hashable, Tuple[float, MCPToolResponse]]" = OrderedDict()
+        # Tools are shared across threads (e.g. by example 6's thread pool)
+        self._cache_lock = threading.Lock()
     
     @abstractmethod
     def _run(self, **kwargs) -> Any:
@@ -82,6 +120,43 @@ class MCPTool(ABC):
         """
         pass
     
+    @property
+    def total_execution_time(self) -> float:
+        """Total time spent in run(), in seconds."""
+        return self.total_execution_time_ns / 1e9
+    
+    def _cache_key(self, kwargs: Dict[str, Any]) -> Optional[Hashable]:
+        """
+        Build the response-cache key for a call to a deterministic tool.
+        
+        The default hashes the arguments; tools whose results also depend
+        on external state (e.g. file contents) should fold that in.
+        
+        Args:
+            kwargs: Arguments passed to run()
+            
+        Returns:
+            Cache key, or None if the call should not be cached
+        """
+        return hashlib.blake2b(
+            repr(sorted(kwargs.items())).encode(), digest_size=16
+        ).digest()
+    
+    def _cache_ttl(self, kwargs: Dict[str, Any]) -> float:
+        """
+        Get how long a successful response may be served from the cache.
+        
+        The default never expires entries; tools whose results go stale
+        over time can return a finite TTL per call.
+        
+        Args:
+            kwargs: Arguments passed to run()
+            
+        Returns:
+            TTL in seconds (0 means do not cache)
+        """
+        return float("inf")
+    
     def run(self, **kwargs) -> MCPToolResponse:
         """
         Execute the tool with error handling and timing.
@@ -91,6 +166,10 @@ class MCPTool(ABC):
         - Error handling
         - Response formatting
         - Call counting
+        - Response caching for deterministic tools
+        
+        Cache hits still count as calls and report the (near-zero) lookup
+        time as their execution time, with metadata["cached"] set to True.
         
         Args:
             **kwargs: Tool-specific parameters
@@ -98,38 +177,72 @@ class MCPTool(ABC):
         Returns:
             MCPToolResponse with result or error information
         """
-        start_time = time.time()
-        self.call_count += 1
+        key = None
+        if self.deterministic and self.cache_size:
+            key = self._cache_key(kwargs)
+        if key is None:
+            return self._execute(kwargs)
         
-        try:
-            result = self._run(**kwargs)
-            execution_time = time.time() - start_time
-            self.total_execution_time += execution_time
-            
-            return MCPToolResponse(
-                success=True,
-                result=result,
-                execution_time=execution_time,
+        cache = self._response_cache
+        start_ns = time.perf_counter_ns()
+        with self._cache_lock:
+            entry = cache.get(key)
+            if entry is not None:
+                if start_ns < entry[0]:
+                    cache.move_to_end(key)
+                    self.cache_hits += 1
+                    call_count = self.call_count = self.call_count + 1
+                    cached = entry[1]
+                else:
+                    del cache[key]
+                    entry = None
+        
+        if entry is not None:
+            elapsed_ns = time.perf_counter_ns() - start_ns
+            self.total_execution_time_ns += elapsed_ns
+            return replace(
+                cached,
+                execution_time=elapsed_ns / 1e9,
                 metadata={
-                    "tool_name": self.name,
-                    "call_count": self.call_count
+                    **cached.metadata,
+                    "call_count": call_count,
+                    "cached": True
                 }
             )
         
+        response = self._execute(kwargs)
+        if response.success:
+            ttl = self._cache_ttl(kwargs)
+            if ttl > 0:
+                with self._cache_lock:
+                    cache[key] = (start_ns + ttl * 1e9, response)
+                    if len(cache) > self.cache_size:
+                        cache.popitem(last=False)
+        return response
+    
+    def clear_cache(self):
+        """Drop all memoized responses."""
+        with self._cache_lock:
+            self._response_cache.clear()
+    
+    def _execute(self, kwargs: Dict[str, Any]) -> MCPToolResponse:
+        """Run _run once, timing it and wrapping the outcome in a response."""
+        perf_counter_ns = time.perf_counter_ns
+        call_count = self.call_count = self.call_count + 1
+        metadata = {"tool_name": self.name, "call_count": call_count}
+        
+        start_ns = perf_counter_ns()
+        try:
+            result = self._run(**kwargs)
         except Exception as e:
-            execution_time = time.time() - start_time
-            self.total_execution_time += execution_time
-            
-            return MCPToolResponse(
-                success=False,
-                error=str(e),
-                execution_time=execution_time,
-                metadata={
-                    "tool_name": self.name,
-                    "call_count": self.call_count,
-                    "error_type": type(e).__name__
-                }
-            )
+            elapsed_ns = perf_counter_ns() - start_ns
+            self.total_execution_time_ns += elapsed_ns
+            metadata["error_type"] = type(e).__name__
+            return MCPToolResponse(False, elapsed_ns / 1e9, None, str(e), metadata)
+        
+        elapsed_ns = perf_counter_ns() - start_ns
+        self.total_execution_time_ns += elapsed_ns
+        return MCPToolResponse(True, elapsed_ns / 1e9, result, None, metadata)
     
     def get_stats(self) -> Dict[str, Any]:
         """
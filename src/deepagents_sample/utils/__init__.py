@@ -1,5 +1,8 @@
 """Utility functions and logging configuration."""
 
-from .logger import setup_logger, get_logger
+from .logger import setup_logger, get_logger, AsyncBatchHandler, flush_async_handlers
+from .cache import SemanticCache
+from .models import get_model
+from .loop import get_event_loop, run_async
 
-__all__ = ["setup_logger", "get_logger"]
+__all__ = ["setup_logger", "get_logger", "AsyncBatchHandler", "flush_async_handlers", "SemanticCache", "get_model", "get_event_loop", "run_async"]
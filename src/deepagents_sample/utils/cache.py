@@ -0,0 +1,229 @@
+"""Response caching for agent calls."""
+
+import functools
+import hashlib
+import math
+import operator
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+
+def _prompt_text(messages: Any) -> str:
+    """Flatten chat model input into one string, tagging each message with its role."""
+    if isinstance(messages, str):
+        return messages
+    return "\n".join(
+        f"{getattr(message, 'type', 'human')}: {getattr(message, 'content', message)}"
+        for message in messages
+    )
+
+
+class SemanticCache:
+    """
+    Two-tier cache for agent responses.
+    
+    Lookups first try an exact match on a digest of the prompt. On a miss,
+    if an embedding function is configured, the prompt is embedded and
+    compared against the cached prompts; the best match above the
+    similarity threshold is returned. Without an embedding function the
+    cache behaves as a plain exact-match LRU cache.
+    
+    Cache stateless calls only: wrapping an agent's process() would let
+    hits skip its middleware and conversation history, so agents get
+    their model wrapped instead (see wrap_model).
+    
+    Example:
+        from langchain_openai import OpenAIEmbeddings
+        
+        cache = SemanticCache(embed=OpenAIEmbeddings().embed_query)
+        coordinator.model = cache.wrap_model(coordinator.model)
+    """
+    
+    def __init__(
+        self,
+        embed: Optional[Callable[[str], Sequence[float]]] = None,
+        threshold: float = 0.85,
+        max_size: int = 100
+    ):
+        """
+        Initialize the cache.
+        
+        Args:
+            embed: Optional function mapping a prompt to an embedding vector
+            threshold: Minimum cosine similarity for a near-duplicate hit
+            max_size: Maximum number of cached responses
+        """
+        self.embed = embed
+        self.threshold = threshold
+        self.max_size = max_size
+        self._exact: "OrderedDict[bytes, str]" = OrderedDict()
+        self._vectors: "OrderedDict[bytes, Tuple[List[float], str]]" = OrderedDict()
+        self._last_query: Optional[Tuple[bytes, List[float]]] = None
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def _key(prompt: str) -> bytes:
+        return hashlib.blake2b(prompt.encode(), digest_size=16).digest()
+    
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> List[float]:
+        norm = math.sqrt(math.fsum(x * x for x in vector))
+        if not norm:
+            return list(vector)
+        return [x / norm for x in vector]
+    
+    def get(self, prompt: str) -> Optional[str]:
+        """
+        Look up a cached response for a prompt.
+        
+        Args:
+            prompt: The prompt to look up
+            
+        Returns:
+            Cached response, or None on a miss
+        """
+        key = self._key(prompt)
+        
+        result = self._exact.get(key)
+        if result is not None:
+            self._exact.move_to_end(key)
+            self.exact_hits += 1
+            return result
+        
+        if self.embed is not None and self._vectors:
+            query = self._normalize(self.embed(prompt))
+            # Remember the embedding so a following set() can reuse it
+            self._last_query = (key, query)
+            best_score, best_result = -1.0, None
+            for vector, cached in self._vectors.values():
+                score = sum(map(operator.mul, vector, query))
+                if score > best_score:
+                    best_score, best_result = score, cached
+            
+            if best_score >= self.threshold:
+                self.semantic_hits += 1
+                return best_result
+        
+        self.misses += 1
+        return None
+    
+    def set(self, prompt: str, result: str):
+        """
+        Cache a response for a prompt.
+        
+        Args:
+            prompt: The prompt that produced the response
+            result: The response to cache
+        """
+        key = self._key(prompt)
+        
+        if key not in self._exact and len(self._exact) >= self.max_size:
+            oldest_key, _ = self._exact.popitem(last=False)
+            self._vectors.pop(oldest_key, None)
+        
+        self._exact[key] = result
+        if self.embed is not None:
+            if self._last_query is not None and self._last_query[0] == key:
+                vector = self._last_query[1]
+            else:
+                vector = self._normalize(self.embed(prompt))
+            self._last_query = None
+            self._vectors[key] = (vector, result)
+    
+    def wrap(self, process: Callable[..., str]) -> Callable[..., str]:
+        """
+        Wrap a stateless prompt -> response function so repeated prompts are served from cache.
+        
+        Only calls with a single prompt argument are cached; calls with
+        extra arguments (e.g. context) go straight to the function.
+        
+        Args:
+            process: Function whose result depends only on the prompt
+            
+        Returns:
+            Caching wrapper with the same signature
+        """
+        @functools.wraps(process)
+        def cached_process(task: str, *args, **kwargs) -> str:
+            if args or kwargs:
+                return process(task, *args, **kwargs)
+            
+            cached = self.get(task)
+            if cached is not None:
+                return cached
+            
+            result = process(task)
+            self.set(task, result)
+            return result
+        
+        return cached_process
+    
+    def wrap_model(self, model: Any) -> "CachedModel":
+        """
+        Wrap a chat model so repeated prompts skip the LLM call.
+        
+        The agent using the model still runs its middleware and records
+        its conversation history on every call; only invoke() is cached,
+        keyed on the full message list.
+        
+        Args:
+            model: Chat model with an invoke(messages) method
+            
+        Returns:
+            Model proxy serving invoke() from this cache
+        """
+        return CachedModel(model, self)
+    
+    def get_stats(self) -> dict:
+        """Get cache statistics."""
+        return {
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "cache_size": len(self._exact),
+            "max_size": self.max_size
+        }
+    
+    def clear(self):
+        """Clear the cache."""
+        self._exact.clear()
+        self._vectors.clear()
+        self._last_query = None
+
+
+class CachedModel:
+    """
+    Chat model proxy whose invoke() is answered from a SemanticCache when possible.
+    
+    Other attributes are forwarded to the wrapped model. Create it with
+    SemanticCache.wrap_model().
+    """
+    
+    def __init__(self, model: Any, cache: SemanticCache):
+        self.model = model
+        self.cache = cache
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.model, name)
+    
+    def invoke(self, messages: Any, *args, **kwargs) -> Any:
+        """
+        Invoke the model, or return the cached reply for the same (or a similar) prompt.
+        
+        Calls with extra arguments (e.g. config) are not cached.
+        """
+        if args or kwargs:
+            return self.model.invoke(messages, *args, **kwargs)
+        
+        prompt = _prompt_text(messages)
+        cached = self.cache.get(prompt)
+        if cached is not None:
+            from langchain_core.messages import AIMessage
+            return AIMessage(content=cached)
+        
+        response = self.model.invoke(messages)
+        if isinstance(response.content, str):
+            self.cache.set(prompt, response.content)
+        return response
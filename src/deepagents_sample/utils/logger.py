@@ -2,13 +2,133 @@
 
 import logging
 import sys
-from typing import Optional
+import threading
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+
+class _BatchWriter:
+    """
+    Background writer shared by all AsyncBatchHandler instances.
+    
+    Records from every batched logger go through one queue so their
+    relative order is preserved when they reach the console.
+    """
+    
+    def __init__(self, batch_size: int = 256, interval: float = 0.05):
+        self.batch_size = batch_size
+        self.interval = interval
+        self._queue: Deque[Tuple[logging.Handler, logging.LogRecord]] = deque()
+        self._wakeup = threading.Event()
+        self._drain_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+    
+    def enqueue(self, target: logging.Handler, record: logging.LogRecord):
+        """Append a record; only wake the writer once a full batch is waiting."""
+        queue = self._queue
+        queue.append((target, record))
+        
+        if self._thread is None:
+            self._start()
+        if len(queue) >= self.batch_size:
+            self._wakeup.set()
+    
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="log-batch-writer", daemon=True
+                )
+                self._thread.start()
+    
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.flush()
+    
+    def flush(self):
+        """Format and emit everything queued so far, in batches."""
+        queue = self._queue
+        with self._drain_lock:
+            while queue:
+                targets = set()
+                for _ in range(min(self.batch_size, len(queue))):
+                    target, record = queue.popleft()
+                    target.handle(record)
+                    targets.add(target)
+                for target in targets:
+                    target.flush()
+
+
+_writer = _BatchWriter()
+
+
+class AsyncBatchHandler(logging.Handler):
+    """
+    Logging handler that defers formatting and I/O to a background thread.
+    
+    emit() renders the log message and appends the record to a queue; a
+    daemon thread formats and writes queued records through the wrapped
+    handler in batches. Call flush() (or logging.shutdown(), which runs at
+    interpreter exit) to drain pending records synchronously.
+    
+    The message is rendered on the calling thread, so log arguments may be
+    mutated after the logging call without changing what gets written.
+    
+    Example:
+        handler = AsyncBatchHandler(logging.StreamHandler(sys.stdout))
+        logger.addHandler(handler)
+    """
+    
+    def __init__(self, target: logging.Handler):
+        """
+        Initialize the handler.
+        
+        Args:
+            target: Handler that performs the actual formatting and output
+        """
+        super().__init__(level=target.level)
+        self.target = target
+    
+    def handle(self, record: logging.LogRecord) -> bool:
+        # Skip the per-record handler lock; the queue append is thread-safe
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+    
+    def emit(self, record: logging.LogRecord):
+        # Render the message now, as QueueHandler does: args may be mutable
+        # objects the caller changes before the writer thread gets here
+        try:
+            record.msg = record.getMessage()
+        except Exception:
+            self.handleError(record)
+            return
+        record.args = None
+        _writer.enqueue(self.target, record)
+    
+    def flush(self):
+        _writer.flush()
+    
+    def close(self):
+        _writer.flush()
+        self.target.close()
+        super().close()
+
+
+def flush_async_handlers():
+    """Drain all records queued by AsyncBatchHandler instances."""
+    _writer.flush()
 
 
 def setup_logger(
     name: str = "deepagents_sample",
     level: int = logging.INFO,
-    format_string: Optional[str] = None
+    format_string: Optional[str] = None,
+    async_batch: bool = False
 ) -> logging.Logger:
     """
     Set up a logger with consistent formatting.
@@ -17,6 +137,8 @@ def setup_logger(
         name: Logger name
         level: Logging level (default: INFO)
         format_string: Custom format string (optional)
+        async_batch: Format and write records on a background thread in
+            batches instead of on the calling thread
         
     Returns:
         Configured logger instance
@@ -41,6 +163,9 @@ def setup_logger(
         )
         handler.setFormatter(formatter)
         
+        if async_batch:
+            handler = AsyncBatchHandler(handler)
+        
         # Add handler to logger
         logger.addHandler(handler)
     
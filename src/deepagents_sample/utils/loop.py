@@ -0,0 +1,48 @@
+"""Shared event loop for running async examples."""
+
+import asyncio
+from typing import Any, Awaitable, Optional
+
+try:
+    import uvloop as _uvloop
+except ImportError:  # uvloop is optional
+    _uvloop = None
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the process-wide event loop, creating it on first use.
+    
+    The loop is kept open between runs so connections pooled by the
+    shared async HTTP client (see get_model) stay usable. uvloop is used
+    when it is installed.
+    
+    Returns:
+        The shared event loop
+    """
+    global _loop
+    
+    if _loop is None or _loop.is_closed():
+        _loop = _uvloop.new_event_loop() if _uvloop is not None else asyncio.new_event_loop()
+    
+    return _loop
+
+
+def run_async(coro: Awaitable[Any]) -> Any:
+    """
+    Run a coroutine to completion on the shared event loop.
+    
+    Use this instead of asyncio.run(), which closes its loop (and strands
+    any pooled connections) when the coroutine finishes.
+    
+    Args:
+        coro: Coroutine to run
+        
+    Returns:
+        The coroutine's result
+    """
+    loop = get_event_loop()
+    asyncio.set_event_loop(loop)
+    return loop.run_until_complete(coro)
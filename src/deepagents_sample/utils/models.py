@@ -0,0 +1,57 @@
+"""Shared chat model instances."""
+
+from functools import lru_cache
+
+# Keep-alive pool shared by every model instance, so agents reuse open
+# connections instead of each paying its own TCP/TLS handshake
+_POOL_LIMITS = {"max_connections": 64, "max_keepalive_connections": 32}
+
+_http_client = None
+_http_async_client = None
+
+
+def _shared_http_clients():
+    """Create (once) the sync and async HTTP clients used by all models."""
+    global _http_client, _http_async_client
+    
+    if _http_client is None:
+        import httpx
+        
+        limits = httpx.Limits(**_POOL_LIMITS)
+        _http_client = httpx.Client(limits=limits)
+        _http_async_client = httpx.AsyncClient(limits=limits)
+    
+    return _http_client, _http_async_client
+
+
+@lru_cache(maxsize=8)
+def get_model(
+    model: str = "gpt-4o-mini",
+    temperature: float = 0,
+    streaming: bool = False
+):
+    """
+    Get a shared ChatOpenAI instance for the given configuration.
+    
+    Repeated calls with the same arguments return the same instance, and
+    all instances share one HTTP connection pool.
+    
+    Args:
+        model: OpenAI model name
+        temperature: Sampling temperature
+        streaming: Whether to stream responses
+        
+    Returns:
+        ChatOpenAI instance
+    """
+    from langchain_openai import ChatOpenAI
+    
+    http_client, http_async_client = _shared_http_clients()
+    
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        streaming=streaming,
+        http_client=http_client,
+        http_async_client=http_async_client
+    )
@@ -1,18 +1,45 @@
 """LangGraph workflow for agent orchestration."""
 
-from typing import Literal
-from langchain_core.messages import HumanMessage, AIMessage
-from langgraph.graph import StateGraph, END
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, Literal, Optional, Tuple
 
 from .state import AgentState
-from ..agents import CoordinatorAgent, ResearchAgent, AnalysisAgent
-from ..middleware import MiddlewareChain
+
+if TYPE_CHECKING:
+    from ..agents import CoordinatorAgent, ResearchAgent, AnalysisAgent
+
+# Task keywords that decide the route without asking the coordinator LLM.
+# Tasks matching only one list skip the LLM entirely, so keep them narrow.
+_ANALYSIS_RE = re.compile(r"\b(analy[sz]e|summari[sz]e|insight|report)\b", re.I)
+_RESEARCH_RE = re.compile(r"\b(search|find|fetch|command|run|query|lookup)\b", re.I)
+
+# Agent named in the coordinator LLM's routing reply
+_ROUTING_RE = re.compile(r"(research|analysis)", re.I)
+
+
+def _keyword_route(task: str) -> Optional[str]:
+    """
+    Route a task by its keywords alone.
+    
+    Args:
+        task: The task text
+        
+    Returns:
+        "research" or "analysis", or None if the keywords are missing or
+        point both ways and the coordinator should decide
+    """
+    analysis = _ANALYSIS_RE.search(task) is not None
+    research = _RESEARCH_RE.search(task) is not None
+    if analysis == research:
+        return None
+    return "analysis" if analysis else "research"
 
 
 def create_agent_workflow(
-    coordinator: CoordinatorAgent,
-    research_agent: ResearchAgent,
-    analysis_agent: AnalysisAgent
+    coordinator: "CoordinatorAgent",
+    research_agent: "ResearchAgent",
+    analysis_agent: "AnalysisAgent"
 ):
     """
     Create a LangGraph workflow with coordinator and subagents.
@@ -32,17 +59,51 @@ def create_agent_workflow(
     Returns:
         Compiled LangGraph workflow
     """
+    # Imported here so importing the workflow package stays cheap
+    from langchain_core.messages import HumanMessage, AIMessage
+    from langgraph.graph import StateGraph, END
     
-    # Define node functions
-    def coordinator_node(state: AgentState) -> AgentState:
+    @lru_cache(maxsize=128)
+    def choose_agent(task: str) -> Tuple[str, Optional[str]]:
+        """
+        Decide which subagent handles a task.
+        
+        Clear-cut tasks are routed by keyword; only ambiguous ones cost a
+        coordinator LLM call. Decisions are cached per task.
+        
+        Returns:
+            Tuple of (next agent, routing prompt sent to the LLM or None)
+        """
+        next_agent = _keyword_route(task)
+        if next_agent is not None:
+            return next_agent, None
+        
+        # Analyze task and decide routing
+        prompt = f"""Analyze this task and decide which agent should handle it:
+
+Task: {task}
+
+Available agents:
+- research_agent: Gathers information, executes commands, queries data
+- analysis_agent: Analyzes data, generates insights, creates summaries
+
+Respond with ONLY the agent name (research_agent or analysis_agent) that should handle this task."""
+        
+        # Get coordinator decision
+        response = coordinator.process(prompt)
+        
+        # Determine next agent from the first agent named (default: research)
+        match = _ROUTING_RE.search(response)
+        return (match.group(1).lower() if match else "research"), prompt
+    
+    # Define node functions. Each returns only the keys it changes; the
+    # list reducers on AgentState append the new entries to the history.
+    def coordinator_node(state: AgentState) -> dict:
         """
         Coordinator node that analyzes the task and routes to subagents.
         """
         task = state["current_task"]
         
-        # Add to agent history
-        state["agent_history"] = state.get("agent_history", []) + ["coordinator"]
-        
         # Check if we have results from subagents
         if state.get("results"):
             # Aggregate results
@@ -52,96 +113,64 @@ def create_agent_workflow(
             ]
             final_output = coordinator.aggregate_results(results_list)
             
-            state["final_output"] = final_output
-            state["next_agent"] = None  # End workflow
-            state["messages"] = state.get("messages", []) + [
-                AIMessage(content=f"Coordinator aggregated results: {final_output}")
-            ]
-        else:
-            # Analyze task and decide routing
-            prompt = f"""Analyze this task and decide which agent should handle it:
-
-Task: {task}
-
-Available agents:
-- research_agent: Gathers information, executes commands, queries data
-- analysis_agent: Analyzes data, generates insights, creates summaries
-
-Respond with ONLY the agent name (research_agent or analysis_agent) that should handle this task."""
-            
-            state["messages"] = state.get("messages", []) + [
-                HumanMessage(content=prompt)
-            ]
-            
-            # Get coordinator decision
-            response = coordinator.process(prompt)
-            
-            # Determine next agent based on response
-            if "research" in response.lower():
-                state["next_agent"] = "research"
-            elif "analysis" in response.lower():
-                state["next_agent"] = "analysis"
-            else:
-                # Default to research
-                state["next_agent"] = "research"
-            
-            state["messages"] = state.get("messages", []) + [
-                AIMessage(content=f"Coordinator routing to: {state['next_agent']}")
-            ]
+            return {
+                "agent_history": ["coordinator"],
+                "final_output": final_output,
+                "next_agent": None,  # End workflow
+                "messages": [
+                    AIMessage(content=f"Coordinator aggregated results: {final_output}")
+                ]
+            }
+        
+        next_agent, prompt = choose_agent(task)
         
-        return state
+        messages = [AIMessage(content=f"Coordinator routing to: {next_agent}")]
+        if prompt is not None:
+            messages.insert(0, HumanMessage(content=prompt))
+        
+        return {
+            "agent_history": ["coordinator"],
+            "next_agent": next_agent,
+            "messages": messages
+        }
     
-    def research_node(state: AgentState) -> AgentState:
+    def research_node(state: AgentState) -> dict:
         """
         Research agent node that gathers information.
         """
         task = state["current_task"]
         
-        # Add to agent history
-        state["agent_history"] = state.get("agent_history", []) + ["research_agent"]
-        
         # Process with research agent
         result = research_agent.process(task)
         
-        # Add result to state
-        results = state.get("results", {})
-        results["research_agent"] = result
-        state["results"] = results
-        
-        state["messages"] = state.get("messages", []) + [
-            AIMessage(content=f"Research agent completed: {result[:200]}...")
-        ]
-        
-        # Route back to coordinator
-        state["next_agent"] = "coordinator"
-        
-        return state
+        return {
+            "agent_history": ["research_agent"],
+            "results": {"research_agent": result},
+            "messages": [
+                AIMessage(content=f"Research agent completed: {result[:200]}...")
+            ],
+            # Route back to coordinator
+            "next_agent": "coordinator"
+        }
     
-    def analysis_node(state: AgentState) -> AgentState:
+    def analysis_node(state: AgentState) -> dict:
         """
         Analysis agent node that analyzes data.
         """
         task = state["current_task"]
         
-        # Add to agent history
-        state["agent_history"] = state.get("agent_history", []) + ["analysis_agent"]
-        
         # Process with analysis agent
         result = analysis_agent.process(task)
         
-        # Add result to state
-        results = state.get("results", {})
-        results["analysis_agent"] = result
-        state["results"] = results
-        
-        state["messages"] = state.get("messages", []) + [
-            AIMessage(content=f"Analysis agent completed: {result[:200]}...")
-        ]
-        
-        # Route back to coordinator
-        state["next_agent"] = "coordinator"
-        
-        return state
+        return {
+            "agent_history": ["analysis_agent"],
+            "results": {"analysis_agent": result},
+            "messages": [
+                AIMessage(content=f"Analysis agent completed: {result[:200]}...")
+            ],
+            # Route back to coordinator
+            "next_agent": "coordinator"
+        }
     
     def route_after_coordinator(
         state: AgentState
@@ -5,6 +5,11 @@ from langchain_core.messages import BaseMessage
 import operator
 
 
+def _merge_dict(current: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    """Reducer that merges a node's new entries into an accumulated dict."""
+    return {**current, **update}
+
+
 class AgentState(TypedDict):
     """
     State shared across the LangGraph workflow.
@@ -29,7 +34,7 @@ class AgentState(TypedDict):
     current_task: str
     
     # Results dictionary is merged across nodes
-    results: Annotated[Dict[str, Any], operator.add]
+    results: Annotated[Dict[str, Any], _merge_dict]
     
     # Agent history is accumulated
     agent_history: Annotated[List[str], operator.add]
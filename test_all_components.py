@@ -2,405 +2,1086 @@
 """
 Comprehensive Test Suite for DeepAgents Sample Project
 
-Tests all components to verify functionality.
+Tests all components to verify functionality. Run with pytest (add
+`-n auto` when pytest-xdist is installed to spread the tests across
+workers), or execute this file directly.
 """
 
+import importlib
 import sys
 import os
-import logging
-from pathlib import Path
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='[%(levelname)s] %(message)s'
+import pytest
+
+# Paths below are relative to the project root, wherever pytest is run from
+ROOT = os.path.dirname(os.path.realpath(__file__))
+
+
+def _list_dir(parent):
+    """Return the entry names of a directory under ROOT (empty if missing)."""
+    try:
+        with os.scandir(os.path.join(ROOT, parent)) as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
+
+
+def _missing_files(paths):
+    """Return the paths (relative to ROOT) that do not exist.
+
+    Scans each parent directory once with os.scandir instead of issuing a
+    stat per file.
+    """
+    splits = [os.path.split(path) for path in paths]
+    index = {}
+    for parent, _ in splits:
+        if parent not in index:
+            index[parent] = _list_dir(parent)
+
+    return [
+        path for path, (parent, name) in zip(paths, splits)
+        if name not in index[parent]
+    ]
+
+
+# Subpackages every component test needs
+CORE_MODULES = (
+    "deepagents_sample.middleware",
+    "deepagents_sample.tools",
+    "deepagents_sample.agents",
+    "deepagents_sample.workflow",
 )
-logger = logging.getLogger(__name__)
 
+# Tests that do not touch the package (test_imports reports import failures)
+IMPORT_INDEPENDENT_TESTS = frozenset({"test_imports", "test_examples", "test_documentation"})
+
+
+@pytest.fixture(scope="session")
+def core_import_error():
+    """First error raised importing CORE_MODULES, or None if they all import."""
+    for module_path in CORE_MODULES:
+        try:
+            importlib.import_module(module_path)
+        except Exception as e:
+            return f"{module_path}: {e}"
+    return None
+
+
+@pytest.fixture(autouse=True)
+def _require_core_imports(request, core_import_error):
+    """Skip component tests up front once the core imports have failed."""
+    if core_import_error and request.function.__name__ not in IMPORT_INDEPENDENT_TESTS:
+        pytest.skip(f"core imports failed ({core_import_error}); see test_imports")
+
+
+@pytest.fixture(scope="session")
+def middleware_chain():
+    """Logging + Metrics middleware chain shared by the session."""
+    from deepagents_sample.middleware import (
+        MiddlewareChain, LoggingMiddleware, MetricsMiddleware
+    )
+
+    chain = MiddlewareChain()
+    chain.add(LoggingMiddleware(verbose=False))
+    chain.add(MetricsMiddleware())
+    return chain
+
+
+@pytest.fixture(scope="session")
+def llm_model():
+    """Chat model for agent tests; skips when no OpenAI key is configured."""
+    if not os.getenv("OPENAI_API_KEY"):
+        pytest.skip("OPENAI_API_KEY not set")
+
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(model="gpt-4o-mini", temperature=0)
+
+
+@pytest.fixture(scope="session")
+def coordinator_agent(llm_model, middleware_chain):
+    """CoordinatorAgent on the shared model and middleware chain."""
+    from deepagents_sample.agents import CoordinatorAgent
+    return CoordinatorAgent(model=llm_model, middleware_chain=middleware_chain)
+
+
+@pytest.fixture(scope="session")
+def research_agent(llm_model, middleware_chain):
+    """ResearchAgent on the shared model and middleware chain."""
+    from deepagents_sample.agents import ResearchAgent
+    return ResearchAgent(model=llm_model, middleware_chain=middleware_chain)
 
-def print_section(title):
-    """Print a formatted section header."""
-    logger.info("\n" + "="*70)
-    logger.info(f"  {title}")
-    logger.info("="*70 + "\n")
+
+@pytest.fixture(scope="session")
+def analysis_agent(llm_model, middleware_chain):
+    """AnalysisAgent on the shared model and middleware chain."""
+    from deepagents_sample.agents import AnalysisAgent
+    return AnalysisAgent(model=llm_model, middleware_chain=middleware_chain)
+
+
+@pytest.fixture(scope="session")
+def command_tool():
+    """CommandTool restricted to a few harmless commands, shared by the session."""
+    from deepagents_sample.tools import CommandTool
+
+    return CommandTool(timeout=10, allowed_commands=["echo", "date", "pwd"])
+
+
+@pytest.fixture(scope="session")
+def json_tool():
+    """JSONSearchTool shared by the session; skips when jq is missing."""
+    from deepagents_sample.tools import JSONSearchTool
+
+    try:
+        return JSONSearchTool(check_jq=True)
+    except RuntimeError as e:
+        pytest.skip(f"jq not installed: {e}")
+
+
+@pytest.fixture(scope="session")
+def data_file():
+    """Path of the bundled sample data."""
+    path = os.path.join(ROOT, "data", "sample.json")
+    if not os.path.exists(path):
+        pytest.skip("Sample data file not found")
+    return path
+
+
+COMMAND_CASES = [
+    ("echo 'test'", lambda output: "test" in output),
+    ("date", bool),
+    ("pwd", bool),
+]
+
+# Printed between commands when the command cases run as a single batch
+COMMAND_SEPARATOR = "---SEP---"
+
+JSON_CASES = [
+    (".", lambda result: "users" in result),
+    (".users | length", lambda result: result == 3),
+    ('.users[] | select(.role == "engineer")', bool),
+]
+
+EXAMPLE_FILES = (
+    "src/deepagents_sample/examples/example1_basic_middleware.py",
+    "src/deepagents_sample/examples/example2_langgraph_subagents.py",
+    "src/deepagents_sample/examples/example3_mcp_tools.py",
+    "src/deepagents_sample/examples/run_all.py",
+)
+
+# Documentation path -> description
+DOC_FILES = {
+    "README.md": "Main documentation",
+    "docs/archive/QUICKSTART.md": "Quick start guide",
+    ".project-summary.md": "Project summary",
+    "pyproject.toml": "Project configuration",
+    "data/sample.json": "Sample data",
+}
 
 
 def test_imports():
     """Test that all modules can be imported."""
-    print_section("TEST 1: Module Imports")
-    
     tests = [
-        ("Middleware Base", "from deepagents_sample.middleware import BaseMiddleware, AgentRequest, AgentResponse, MiddlewareChain"),
-        ("LoggingMiddleware", "from deepagents_sample.middleware import LoggingMiddleware"),
-        ("MetricsMiddleware", "from deepagents_sample.middleware import MetricsMiddleware"),
-        ("MCP Base", "from deepagents_sample.tools import MCPTool, MCPToolRequest, MCPToolResponse"),
-        ("CommandTool", "from deepagents_sample.tools import CommandTool"),
-        ("JSONSearchTool", "from deepagents_sample.tools import JSONSearchTool"),
-        ("CoordinatorAgent", "from deepagents_sample.agents import CoordinatorAgent"),
-        ("ResearchAgent", "from deepagents_sample.agents import ResearchAgent"),
-        ("AnalysisAgent", "from deepagents_sample.agents import AnalysisAgent"),
-        ("Workflow State", "from deepagents_sample.workflow import AgentState"),
-        ("Workflow Graph", "from deepagents_sample.workflow import create_agent_workflow"),
+        ("Middleware Base", "deepagents_sample.middleware", ["BaseMiddleware", "AgentRequest", "AgentResponse", "MiddlewareChain"]),
+        ("LoggingMiddleware", "deepagents_sample.middleware", ["LoggingMiddleware"]),
+        ("MetricsMiddleware", "deepagents_sample.middleware", ["MetricsMiddleware"]),
+        ("MCP Base", "deepagents_sample.tools", ["MCPTool", "MCPToolRequest", "MCPToolResponse"]),
+        ("CommandTool", "deepagents_sample.tools", ["CommandTool"]),
+        ("JSONSearchTool", "deepagents_sample.tools", ["JSONSearchTool"]),
+        ("CoordinatorAgent", "deepagents_sample.agents", ["CoordinatorAgent"]),
+        ("ResearchAgent", "deepagents_sample.agents", ["ResearchAgent"]),
+        ("AnalysisAgent", "deepagents_sample.agents", ["AnalysisAgent"]),
+        ("Workflow State", "deepagents_sample.workflow", ["AgentState"]),
+        ("Workflow Graph", "deepagents_sample.workflow", ["create_agent_workflow"]),
     ]
-    
-    passed = 0
-    failed = 0
-    
-    for name, import_stmt in tests:
+
+    failed = []
+    for name, module_path, symbols in tests:
         try:
-            exec(import_stmt)
-            print(f"✅ {name:30s} - PASSED")
-            passed += 1
+            module = importlib.import_module(module_path)
         except Exception as e:
-            print(f"❌ {name:30s} - FAILED: {e}")
-            failed += 1
-    
-    print(f"\nImport Tests: {passed} passed, {failed} failed")
-    return failed == 0
+            failed.append(f"{name}: {e}")
+            continue
+        missing = [symbol for symbol in symbols if not hasattr(module, symbol)]
+        if missing:
+            failed.append(f"{name}: {module_path} has no {', '.join(missing)}")
+
+    assert not failed, "Import failures:\n" + "\n".join(failed)
 
 
-def test_middleware():
+def test_middleware(middleware_chain):
     """Test middleware functionality."""
-    print_section("TEST 2: Middleware Functionality")
-    
-    from deepagents_sample.middleware import (
-        MiddlewareChain, LoggingMiddleware, MetricsMiddleware,
-        AgentRequest, AgentResponse
-    )
-    
-    try:
-        # Create middleware chain
-        chain = MiddlewareChain()
-        chain.add(LoggingMiddleware(verbose=False))
-        chain.add(MetricsMiddleware())
-        print("✅ Middleware chain created")
-        
-        # Test request processing
-        request = AgentRequest("test_agent", "test input", {"key": "value"})
-        processed_request = chain.process_request(request)
-        print("✅ Request processing works")
-        
-        # Test response processing
-        response = AgentResponse("test_agent", "test output", request.request_id)
-        processed_response = chain.process_response(response)
-        print("✅ Response processing works")
-        
-        # Check metrics
-        metrics = chain.middlewares[1]  # MetricsMiddleware
-        stats = metrics.get_total_stats()
-        assert stats['total_requests'] == 1
-        assert stats['total_responses'] == 1
-        print("✅ Metrics tracking works")
-        
-        print("\n✅ All middleware tests PASSED")
-        return True
-        
-    except Exception as e:
-        print(f"\n❌ Middleware test FAILED: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-
-
-def test_command_tool():
-    """Test CommandTool functionality."""
-    print_section("TEST 3: CommandTool")
-    
+    from deepagents_sample.middleware import AgentRequest, AgentResponse
+
+    # The chain is shared by the session, so compare against a baseline
+    metrics = middleware_chain.middlewares[1]  # MetricsMiddleware
+    before = metrics.get_total_stats()
+
+    # Test request processing
+    request = AgentRequest("test_agent", "test input", {"key": "value"})
+    middleware_chain.process_request(request)
+
+    # Test response processing
+    response = AgentResponse("test_agent", "test output", request.request_id)
+    middleware_chain.process_response(response)
+
+    # Check metrics
+    stats = metrics.get_total_stats()
+    assert stats['total_requests'] == before['total_requests'] + 1
+    assert stats['total_responses'] == before['total_responses'] + 1
+
+
+def test_metrics_stats_rounded():
+    """Test that the public metrics stats are rounded to 2 decimals."""
+    from deepagents_sample.middleware import AgentResponse, MetricsMiddleware
+
+    metrics = MetricsMiddleware()
+    shard = metrics._shard()
+    for duration_ns in (1_234_567, 3_456_789):
+        metrics._record(shard, AgentResponse("agent", "", 1), duration_ns)
+
+    assert metrics.get_agent_stats("agent") == {
+        "count": 2, "min_ms": 1.23, "max_ms": 3.46, "avg_ms": 2.35, "total_ms": 4.69
+    }
+    stats = metrics.get_total_stats()
+    assert (stats["total_time_ms"], stats["avg_time_ms"]) == (4.69, 2.35)
+
+
+@pytest.fixture
+def batched_loggers():
+    """Two loggers writing through AsyncBatchHandlers into one shared list."""
+    import logging
+    from deepagents_sample.utils import AsyncBatchHandler
+
+    class ListHandler(logging.Handler):
+        def emit(self, record):
+            sink.append(self.format(record))
+
+    sink = []
+    loggers = []
+    for name in ("batch_test_a", "batch_test_b"):
+        logger = logging.getLogger(name)
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        handler = ListHandler()
+        handler.setFormatter(logging.Formatter("%(name)s %(message)s"))
+        logger.addHandler(AsyncBatchHandler(handler))
+        loggers.append(logger)
+    yield loggers, sink
+    for logger in loggers:
+        for handler in logger.handlers[:]:
+            logger.removeHandler(handler)
+
+
+def test_async_batch_handler_order(batched_loggers):
+    """Test that batched records from several loggers are written in call order."""
+    from deepagents_sample.utils import flush_async_handlers
+
+    loggers, sink = batched_loggers
+    for i in range(600):  # several batches' worth
+        loggers[i % 2].info("record %d", i)
+    flush_async_handlers()
+
+    assert sink == [f"{loggers[i % 2].name} record {i}" for i in range(600)]
+
+
+def test_async_batch_handler_renders_at_call_time(batched_loggers):
+    """Test that mutating a log argument after the call doesn't change the message."""
+    from deepagents_sample.utils import flush_async_handlers
+
+    (logger, _), sink = batched_loggers
+    items = ["before"]
+    logger.info("items=%s", items)
+    items[0] = "after"
+    flush_async_handlers()
+
+    assert sink == ["batch_test_a items=['before']"]
+
+
+def _tag_chain(names):
+    """MiddlewareChain whose middleware append their names to requests and responses."""
+    from deepagents_sample.middleware import BaseMiddleware, MiddlewareChain
+
+    class Tag(BaseMiddleware):
+        def process_request(self, request):
+            request.input_data += self.name
+            return request
+
+        def process_response(self, response):
+            response.output_data += self.name
+            return response
+
+    chain = MiddlewareChain()
+    for name in names:
+        chain.add(Tag(name))
+    return chain
+
+
+def test_middleware_linked_chain():
+    """Test that execute_*_chain on the first middleware runs the whole chain."""
+    from deepagents_sample.middleware import AgentRequest, AgentResponse
+
+    first = _tag_chain("abc").middlewares[0]
+    assert first.execute_request_chain(AgentRequest("agent", "")).input_data == "abc"
+    assert first.execute_response_chain(AgentResponse("agent", "", 1)).output_data == "cba"
+
+
+@pytest.mark.parametrize("names", ["", "a", "ab", "abc"])
+def test_middleware_chain_paths_agree(names):
+    """Test that the frozen, batch and wrapped paths match the plain chain order."""
+    from deepagents_sample.middleware import AgentRequest, AgentResponse
+
+    chain = _tag_chain(names)
+
+    # First call freezes the chain; the second goes through the installed dispatchers
+    for _ in range(2):
+        assert chain.process_request(AgentRequest("agent", "")).input_data == names
+        assert chain.process_response(AgentResponse("agent", "", 1)).output_data == names[::-1]
+
+    requests = chain.process_request_batch([AgentRequest("agent", str(i)) for i in range(3)])
+    assert [r.input_data for r in requests] == [f"{i}{names}" for i in range(3)]
+    responses = chain.process_response_batch([AgentResponse("agent", str(i), i) for i in range(3)])
+    assert [r.output_data for r in responses] == [f"{i}{names[::-1]}" for i in range(3)]
+
+    handle = chain.wrap(lambda request: AgentResponse(
+        request.agent_name, request.input_data + "|", request.request_id
+    ))
+    assert handle(AgentRequest("agent", "")).output_data == f"{names}|{names[::-1]}"
+
+    # Adding a middleware discards the frozen dispatchers
+    chain.add(_tag_chain("z").middlewares[0])
+    assert chain.process_request(AgentRequest("agent", "")).input_data == names + "z"
+    assert chain.process_response(AgentResponse("agent", "", 1)).output_data == "z" + names[::-1]
+
+
+def _list_tool(cache_size):
+    """Deterministic MCPTool that builds a new list on every executed call."""
+    from deepagents_sample.tools import MCPTool
+
+    class ListTool(MCPTool):
+        name = "list_tool"
+        deterministic = True
+        runs = 0
+
+        def _run(self, n: int) -> list:
+            self.runs += 1
+            return list(range(n))
+
+    return ListTool(cache_size=cache_size)
+
+
+def test_mcp_tool_memo():
+    """Test that deterministic tools serve repeats from the cache without copying results."""
+    tool = _list_tool(cache_size=2)
+    first = tool.run(n=3)
+    second = tool.run(n=3)
+
+    assert tool.runs == 1 and tool.cache_hits == 1
+    assert not first.metadata.get("cached") and second.metadata["cached"]
+    assert (first.metadata["call_count"], second.metadata["call_count"]) == (1, 2)
+    # Results are shared, read-only objects; each hit gets its own metadata
+    assert second.result is first.result
+    second.metadata["note"] = "mine"
+    assert "note" not in tool.run(n=3).metadata
+
+    # Bounded LRU: n=3 was used last, so n=4 is evicted by n=5
+    tool.run(n=4)
+    tool.run(n=3)
+    tool.run(n=5)
+    tool.run(n=4)
+    assert tool.runs == 4
+    assert tool.get_stats()["call_count"] == 7
+
+
+def test_command_tool_batch(command_tool):
+    """Test all command cases in a single shell invocation."""
+    batch = f"; echo {COMMAND_SEPARATOR}; ".join(command for command, _ in COMMAND_CASES)
+    response = command_tool.run(command=batch)
+    assert response.success, response.error
+
+    outputs = response.result.split(COMMAND_SEPARATOR)
+    assert len(outputs) == len(COMMAND_CASES)
+    for (command, check), output in zip(COMMAND_CASES, outputs):
+        assert check(output.strip()), f"{command!r} produced {output!r}"
+
+
+def test_command_tool_stats():
+    """Test that CommandTool counts every call."""
     from deepagents_sample.tools import CommandTool
-    
-    try:
-        tool = CommandTool(timeout=10, allowed_commands=["echo", "date", "pwd"])
-        print("✅ CommandTool created")
-        
-        # Test echo command
-        response = tool.run(command="echo 'test'")
-        assert response.success
-        assert "test" in response.result
-        print(f"✅ Echo command: {response.result}")
-        
-        # Test date command
-        response = tool.run(command="date")
-        assert response.success
-        print(f"✅ Date command: {response.result[:50]}...")
-        
-        # Test pwd command
-        response = tool.run(command="pwd")
-        assert response.success
-        print(f"✅ PWD command: {response.result}")
-        
-        # Test stats
-        stats = tool.get_stats()
-        assert stats['call_count'] == 3
-        print(f"✅ Tool stats: {stats['call_count']} calls")
-        
-        print("\n✅ All CommandTool tests PASSED")
-        return True
-        
-    except Exception as e:
-        print(f"\n❌ CommandTool test FAILED: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-
-
-def test_json_tool():
+
+    tool = CommandTool(timeout=10, allowed_commands=["echo", "date", "pwd"])
+    for command, _ in COMMAND_CASES:
+        tool.run(command=command)
+
+    assert tool.get_stats()['call_count'] == len(COMMAND_CASES)
+
+
+def test_command_tool_cache_ttl(monkeypatch):
+    """Test that cached command results expire after their TTL."""
+    import time
+    from deepagents_sample.tools import CommandTool
+
+    clock_ns = [0]
+    monkeypatch.setattr(time, "perf_counter_ns", lambda: clock_ns[0])
+
+    tool = CommandTool(timeout=10, allowed_commands=["echo"])
+    tool.CACHE_TTLS = {"echo": 1.0}
+
+    assert not tool.run(command="echo ttl").metadata.get("cached")
+
+    clock_ns[0] = 500_000_000
+    response = tool.run(command="echo ttl")
+    assert response.metadata.get("cached")
+    assert response.result == "ttl"
+
+    clock_ns[0] = 1_500_000_000
+    assert not tool.run(command="echo ttl").metadata.get("cached")
+    assert tool.cache_hits == 1
+
+
+@pytest.mark.parametrize("command", [
+    "echo a; echo b", "echo $HOME", "echo a | cat", "echo hi\ndate", "echo hi\rdate",
+])
+def test_command_tool_cache_skips_shell_syntax(command):
+    """Test that commands using shell syntax always run."""
+    from deepagents_sample.tools import CommandTool
+
+    tool = CommandTool(timeout=10, allowed_commands=["echo"])
+    for _ in range(2):
+        response = tool.run(command=command)
+        assert response.success, response.error
+        assert not response.metadata.get("cached")
+    assert tool.cache_hits == 0
+
+
+def test_command_tool_cache_keyed_on_cwd(monkeypatch, tmp_path):
+    """Test that a cached pwd result is not served in another directory."""
+    from deepagents_sample.tools import CommandTool
+
+    first, second = tmp_path.resolve() / "first", tmp_path.resolve() / "second"
+    first.mkdir()
+    second.mkdir()
+    tool = CommandTool(timeout=10, allowed_commands=["pwd"])
+
+    monkeypatch.chdir(first)
+    assert tool.run(command="pwd").result == str(first)
+    assert tool.run(command="pwd").metadata.get("cached")
+
+    monkeypatch.chdir(second)
+    response = tool.run(command="pwd")
+    assert not response.metadata.get("cached")
+    assert response.result == str(second)
+
+
+@pytest.mark.parametrize("jq_query,check", JSON_CASES)
+def test_json_tool(json_tool, data_file, jq_query, check):
     """Test JSONSearchTool functionality."""
-    print_section("TEST 4: JSONSearchTool")
-    
+    response = json_tool.run(file_path=data_file, jq_query=jq_query)
+    assert response.success, response.error
+    assert check(response.result)
+
+
+def test_json_tool_stats(json_tool, data_file):
+    """Test that JSONSearchTool counts every call."""
+    calls_before = json_tool.get_stats()['call_count']
+    for jq_query, _ in JSON_CASES:
+        json_tool.run(file_path=data_file, jq_query=jq_query)
+
+    assert json_tool.get_stats()['call_count'] - calls_before == len(JSON_CASES)
+
+
+def test_json_tool_query_many(json_tool, data_file):
+    """Test that query_many runs named queries together and rejects duplicate names."""
+    response = json_tool.query_many(data_file, [
+        ("count", ".users | length"),
+        ("names", ".users[].name"),
+    ])
+    assert response.success, response.error
+    assert response.result["count"] == 3
+    assert "Alice Johnson" in response.result["names"]
+
+    with pytest.raises(ValueError, match="count"):
+        json_tool.query_many(data_file, [("count", ".users | length"), ("count", ".projects | length")])
+
+
+@pytest.mark.parametrize("field_path,expected", [
+    ("users.0.name", "Alice Johnson"),
+    ("users.2.name", "Carol White"),
+    ("users.0.projects.1", "project-b"),
+    ("users.0.missing", None),
+    ("users.99.name", None),
+    ("users[1].name", "Bob Smith"),
+])
+def test_json_tool_get_field(json_tool, data_file, field_path, expected):
+    """Test get_field on dotted paths, with jq's null semantics for missing parts."""
+    assert json_tool.get_field(data_file, field_path) == expected
+
+
+def test_json_tool_get_field_type_mismatch(json_tool, data_file):
+    """Test that get_field reports paths that index into a scalar."""
+    with pytest.raises(RuntimeError):
+        json_tool.get_field(data_file, "users.0.name.first")
+
+
+def test_json_tool_file_caches_bounded(tmp_path):
+    """Test that per-file text/parse caches keep only the cache_size most recent files."""
     from deepagents_sample.tools import JSONSearchTool
-    
-    try:
-        # Check if jq is installed
-        try:
-            tool = JSONSearchTool(check_jq=True)
-            print("✅ jq is installed")
-        except RuntimeError as e:
-            print(f"⚠️  jq not installed: {e}")
-            print("   Skipping JSON tool tests")
-            return True
-        
-        # Test with sample data
-        data_file = Path("data/sample.json")
-        if not data_file.exists():
-            print("⚠️  Sample data file not found, skipping")
-            return True
-        
-        # Test basic query
-        response = tool.run(file_path=str(data_file), jq_query=".")
-        assert response.success
-        print("✅ Basic query works")
-        
-        # Test count query
-        response = tool.run(file_path=str(data_file), jq_query=".users | length")
-        assert response.success
-        assert response.result == 3
-        print(f"✅ Count query: {response.result} users")
-        
-        # Test filter query
-        response = tool.run(
-            file_path=str(data_file),
-            jq_query='.users[] | select(.role == "engineer")'
-        )
-        assert response.success
-        print("✅ Filter query works")
-        
-        # Test stats
-        stats = tool.get_stats()
-        assert stats['call_count'] == 3
-        print(f"✅ Tool stats: {stats['call_count']} calls")
-        
-        print("\n✅ All JSONSearchTool tests PASSED")
-        return True
-        
-    except Exception as e:
-        print(f"\n❌ JSONSearchTool test FAILED: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-
-
-def test_agents():
-    """Test agent creation and basic functionality."""
-    print_section("TEST 5: Agent Creation")
-    
+
+    tool = JSONSearchTool(check_jq=False, cache_size=2)
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"data{i}.json"
+        path.write_text(f'{{"a": {i}}}')
+        paths.append(str(path))
+        assert tool.get_field(paths[-1], "a") == i
+
+    assert list(tool._parsed) == paths[1:]
+
+
+def test_json_tool_cache_invalidated_on_edit(json_tool, tmp_path):
+    """Test that memoized JSONSearchTool responses are dropped when the file changes."""
+    path = tmp_path / "data.json"
+    path.write_text('{"a": 1}')
+    first = json_tool.run(file_path=str(path), jq_query=".a")
+    second = json_tool.run(file_path=str(path), jq_query=".a")
+    assert first.result == 1 and not first.metadata.get("cached")
+    assert second.result == 1 and second.metadata.get("cached")
+
+    # Same size, later mtime: only the stat change can invalidate the entry
+    mtime_ns = path.stat().st_mtime_ns
+    path.write_text('{"a": 2}')
+    os.utime(path, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+    edited = json_tool.run(file_path=str(path), jq_query=".a")
+    assert edited.result == 2 and not edited.metadata.get("cached")
+
+
+@pytest.fixture
+def disk_cached_tool(json_tool, tmp_path):
+    """Factory for fresh JSONSearchTools sharing one disk cache directory."""
+    from deepagents_sample.tools import JSONSearchTool
+
+    cache_dir = tmp_path / "cache"
+    return lambda: JSONSearchTool(check_jq=False, disk_cache_dir=cache_dir)
+
+
+def _disk_cache_files(tool):
+    return sorted(tool.disk_cache_dir.glob("*.json"))
+
+
+def test_json_tool_disk_cache_hit(disk_cached_tool, tmp_path):
+    """Test that a new tool instance reads results stored by an earlier one."""
+    path = tmp_path / "data.json"
+    path.write_text('{"a": 1}')
+    assert disk_cached_tool().run(file_path=str(path), jq_query=".a").result == 1
+
+    tool = disk_cached_tool()
+    [cached] = _disk_cache_files(tool)
+    cached.write_text("42")  # Only a read from disk can produce this
+    assert tool.run(file_path=str(path), jq_query=".a").result == 42
+
+
+def test_json_tool_disk_cache_invalidated_on_edit(disk_cached_tool, tmp_path):
+    """Test that results are keyed on file content, so an edited file is queried again."""
+    path = tmp_path / "data.json"
+    path.write_text('{"a": 1}')
+    assert disk_cached_tool().run(file_path=str(path), jq_query=".a").result == 1
+
+    path.write_text('{"a": 22}')
+    tool = disk_cached_tool()
+    assert tool.run(file_path=str(path), jq_query=".a").result == 22
+    assert len(_disk_cache_files(tool)) == 2
+
+
+def test_json_tool_disk_cache_corrupt_file(disk_cached_tool, tmp_path):
+    """Test that an unreadable cache file is recomputed and overwritten."""
+    import json
+
+    path = tmp_path / "data.json"
+    path.write_text('{"a": 1}')
+    tool = disk_cached_tool()
+    tool.run(file_path=str(path), jq_query=".a")
+    [cached] = _disk_cache_files(tool)
+    cached.write_text('{"trunc')
+
+    response = disk_cached_tool().run(file_path=str(path), jq_query=".a")
+    assert response.success, response.error
+    assert response.result == 1
+    assert json.loads(cached.read_text()) == 1
+
+
+@pytest.fixture
+def coprocess_tool(monkeypatch):
+    """JSONSearchTool forced onto the jq executable (no libjq bindings)."""
+    from deepagents_sample.tools import json_search_tool
+
+    if json_search_tool._jq_version() is None:
+        pytest.skip("jq executable not installed")
+    monkeypatch.setattr(json_search_tool, "_jq", None)
+
+    tool = json_search_tool.JSONSearchTool(cache_size=0)
+    yield tool
+    tool.close()
+
+
+@pytest.mark.parametrize("libjq", [True, False])
+def test_json_tool_streams_large_files(monkeypatch, data_file, libjq):
+    """Test that large files are streamed into jq, with or without libjq."""
+    from deepagents_sample.tools import json_search_tool
+
+    if json_search_tool._jq_version() is None:
+        pytest.skip("jq executable not installed")
+    if not libjq:
+        monkeypatch.setattr(json_search_tool, "_jq", None)
+    elif json_search_tool._jq is None:
+        pytest.skip("libjq bindings not installed")
+
+    tool = json_search_tool.JSONSearchTool()
+    tool.STREAM_MIN_BYTES = 1
+    response = tool.run(file_path=data_file, jq_query=".users[1].name")
+    assert response.success, response.error
+    assert response.result == "Bob Smith"
+    # Nothing was read into the tool's caches or handed to a coprocess
+    assert not tool._parsed and not tool._texts and not tool._processes
+
+
+def test_json_coprocess_outputs(coprocess_tool):
+    """Test single, multiple and empty outputs through the jq coprocess."""
+    data = '{"a": [1, 2], "b": {"c": "x"}}'
+
+    response = coprocess_tool.run(json_data=data, jq_query=".b.c")
+    assert response.success, response.error
+    assert response.result == "x"
+
+    response = coprocess_tool.run(json_data=data, jq_query=".a[]")
+    assert response.success, response.error
+    assert response.result == "1\n2"
+
+    response = coprocess_tool.run(json_data=data, jq_query="empty")
+    assert response.success, response.error
+    assert response.result is None
+
+    # Each query keeps its own long-lived process
+    assert set(coprocess_tool._processes) == {".b.c", ".a[]", "empty"}
+
+
+def test_json_coprocess_errors(coprocess_tool):
+    """Test runtime and compile errors surface as failed responses."""
+    response = coprocess_tool.run(json_data="{}", jq_query='error("boom")')
+    assert not response.success
+    assert "boom" in response.error
+
+    # The process survives a runtime error and serves the next document
+    response = coprocess_tool.run(json_data='{"a": 1}', jq_query='error("boom")')
+    assert "boom" in response.error
+
+    response = coprocess_tool.run(json_data="{}", jq_query=".a |||")
+    assert not response.success
+    assert "compile error" in response.error
+    assert ".a |||" not in coprocess_tool._processes
+
+
+def test_json_coprocess_stderr_does_not_block(coprocess_tool):
+    """Test that stderr output larger than the pipe buffer does not stall jq."""
+    big = "x" * (4 * coprocess_tool.PIPE_BUFFER_SIZE)
+    response = coprocess_tool.run(json_data=f'"{big}"', jq_query="stderr | length")
+    assert response.success, response.error
+    assert response.result == len(big)
+
+
+def test_json_coprocess_restart(coprocess_tool):
+    """Test that a dead jq process is replaced on the next query."""
+    assert coprocess_tool.run(json_data='{"a": 1}', jq_query=".a").result == 1
+
+    proc = coprocess_tool._processes[".a"]
+    proc.kill()
+    proc.wait()
+
+    assert coprocess_tool.run(json_data='{"a": 2}', jq_query=".a").result == 2
+    assert coprocess_tool._processes[".a"] is not proc
+
+
+@pytest.fixture
+def retry_sleeps(monkeypatch):
+    """Delays passed to time.sleep by example 6's RetryableAgent, without sleeping."""
+    from deepagents_sample.examples import example6_parallel_and_retry
+
+    sleeps = []
+    monkeypatch.setattr(example6_parallel_and_retry.time, "sleep", sleeps.append)
+    return sleeps
+
+
+def _failing_attempts(*outcomes):
+    """Build an _attempt replacement that raises or returns outcomes in order."""
+    outcomes = list(outcomes)
+
+    def attempt(task):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return attempt
+
+
+def test_retryable_agent_backoff(retry_sleeps):
+    """Test that RetryableAgent retries with exponential backoff."""
+    from deepagents_sample.examples.example6_parallel_and_retry import RetryableAgent
+
+    agent = RetryableAgent(max_retries=3, min_delay=2, max_delay=10)
+    agent._attempt = _failing_attempts(ConnectionError(), TimeoutError(), "done")
+
+    assert agent.process_with_retry("task") == "done"
+    assert retry_sleeps == [2, 4]
+
+
+def test_retryable_agent_reraises(retry_sleeps):
+    """Test that the last error is re-raised once attempts run out."""
+    from deepagents_sample.examples.example6_parallel_and_retry import RetryableAgent
+
+    agent = RetryableAgent(max_retries=4, min_delay=2, max_delay=5)
+    agent._attempt = _failing_attempts(*(ConnectionError(str(i)) for i in range(4)))
+
+    with pytest.raises(ConnectionError, match="3"):
+        agent.process_with_retry("task")
+    assert retry_sleeps == [2, 4, 5]
+
+
+def test_retryable_agent_non_retryable_error(retry_sleeps):
+    """Test that errors other than connection/timeout errors are not retried."""
+    from deepagents_sample.examples.example6_parallel_and_retry import RetryableAgent
+
+    agent = RetryableAgent(max_retries=3)
+    agent._attempt = _failing_attempts(ValueError("bad input"))
+
+    with pytest.raises(ValueError):
+        agent.process_with_retry("task")
+    assert retry_sleeps == []
+
+
+def test_retryable_agent_requires_an_attempt():
+    """Test that max_retries below 1 is rejected."""
+    from deepagents_sample.examples.example6_parallel_and_retry import RetryableAgent
+
+    with pytest.raises(ValueError):
+        RetryableAgent(max_retries=0)
+
+
+def test_cache_manager_lru():
+    """Test that CacheManager evicts the least recently used task."""
+    from deepagents_sample.examples.example5_caching_and_config import CacheManager
+
+    cache = CacheManager(max_size=2)
+    cache.set("a", "A")
+    cache.set("b", "B")
+    assert cache.get("a") == "A"
+    cache.set("c", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+
+    stats = cache.get_stats()
+    assert (stats.hits, stats.misses, stats.total_requests) == (3, 1, 4)
+    assert stats.hit_rate == 0.75
+    assert (stats.cache_size, stats.max_size) == (2, 2)
+
+
+class _StubModel:
+    """Chat model stand-in that counts invocations."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, messages):
+        from langchain_core.messages import AIMessage
+
+        self.calls += 1
+        return AIMessage(content=f"answer {self.calls}")
+
+
+# Toy 2-d embeddings: "cat" and "kitten" are close, "car" is orthogonal
+_EMBEDDINGS = {"cat": [1.0, 0.0], "kitten": [0.95, 0.1], "car": [0.0, 1.0]}
+
+
+def test_semantic_cache_exact_hits_and_misses():
+    """Test SemanticCache as a plain exact-match LRU cache (no embeddings)."""
+    from deepagents_sample.utils import SemanticCache
+
+    cache = SemanticCache(max_size=2)
+    assert cache.get("cat") is None
+    cache.set("cat", "meow")
+    cache.set("car", "vroom")
+    assert cache.get("cat") == "meow"
+    cache.set("kitten", "mew")  # evicts "car", the least recently used
+
+    assert cache.get("car") is None
+    assert cache.get("kitten") == "mew"
+    assert cache.get_stats() == {
+        "exact_hits": 2, "semantic_hits": 0, "misses": 2, "cache_size": 2, "max_size": 2
+    }
+
+
+def test_semantic_cache_similarity_hits():
+    """Test that near-duplicate prompts hit and dissimilar ones miss."""
+    from deepagents_sample.utils import SemanticCache
+
+    cache = SemanticCache(embed=_EMBEDDINGS.__getitem__, threshold=0.85)
+    cache.set("cat", "meow")
+
+    assert cache.get("kitten") == "meow"
+    assert cache.get("car") is None
+    stats = cache.get_stats()
+    assert (stats["exact_hits"], stats["semantic_hits"], stats["misses"]) == (0, 1, 1)
+
+
+def test_semantic_cache_wrap_model():
+    """Test that a cached model skips the LLM but not the agent's middleware or history."""
+    from deepagents_sample.agents import CoordinatorAgent
+    from deepagents_sample.middleware import MetricsMiddleware, MiddlewareChain
+    from deepagents_sample.utils import SemanticCache
+
+    model = _StubModel()
+    metrics = MetricsMiddleware()
+    agent = CoordinatorAgent(
+        model=SemanticCache().wrap_model(model),
+        middleware_chain=MiddlewareChain().add(metrics)
+    )
+
+    assert agent.process("task") == "answer 1"
+    agent.reset_history()
+    assert agent.process("task") == "answer 1"
+    assert model.calls == 1
+    assert len(agent.conversation_history) == 2
+    assert metrics.get_total_stats()["total_requests"] == 2
+
+    # A different conversation is a different prompt
+    assert agent.process("task") == "answer 2"
+
+
+def test_cached_coordinator_agent():
+    """Test that CachedCoordinatorAgent serves repeated tasks from its CacheManager."""
+    from deepagents_sample.examples.example5_caching_and_config import (
+        CacheManager, CachedCoordinatorAgent
+    )
+
+    model = _StubModel()
+    agent = CachedCoordinatorAgent(model=model)
+    assert isinstance(agent.cache_manager, CacheManager)
+
+    assert agent.process("task") == "answer 1"
+    assert agent.process("task") == "answer 1"
+    assert agent.process("other") == "answer 2"
+    assert model.calls == 2
+    assert agent.cache_manager.get_stats().hits == 1
+
+
+def test_cost_tracker():
+    """Test CostTracker totals, including the fallback for unknown models."""
+    from deepagents_sample.examples.example5_caching_and_config import CostTracker
+
+    tracker = CostTracker()
+    assert tracker.get_summary()["avg_cost_per_call"] == "$0.00"
+
+    tracker.track_call("gpt-4", 1000, 500)
+    tracker.track_call("no-such-model", 4000, 2000)  # billed as gpt-4o-mini
+
+    summary = tracker.get_summary()
+    assert summary["total_calls"] == 2
+    assert summary["total_cost"] == "$0.0618"
+    assert summary["avg_cost_per_call"] == "$0.0309"
+    assert summary["total_input_tokens"] == 5000
+    assert summary["total_output_tokens"] == 2500
+
+
+@pytest.mark.parametrize("text,pattern", [
+    ("Summarize the report", None),
+    ("please DROP TABLE users", "DROP TABLE"),
+    ("eval(x) and then rm -rf /", "eval("),
+    ("drop table users", None),
+])
+def test_find_dangerous_pattern(text, pattern):
+    """Test that the first suspicious pattern in a task is reported."""
+    from deepagents_sample.examples.example5_caching_and_config import find_dangerous_pattern
+
+    assert find_dangerous_pattern(text) == pattern
+
+
+def test_task_input_validation():
+    """Test TaskInput validators and the trusted() bypass for internal tasks."""
+    from deepagents_sample.examples.example5_caching_and_config import TaskInput
+
+    assert TaskInput(task="Analyze data", priority="high").priority == "high"
+    for kwargs in ({"task": "Run this: rm -rf /"}, {"task": "x" * 1001}, {"task": "ok", "priority": "urgent"}):
+        with pytest.raises(ValueError):
+            TaskInput(**kwargs)
+
+    internal = TaskInput.trusted("Run this: rm -rf /", priority="low")
+    assert (internal.task, internal.priority, internal.max_tokens) == ("Run this: rm -rf /", "low", None)
+
+
+class _StubStreamingModel:
+    """Streaming chat model stand-in that yields fixed chunks."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def astream(self, messages):
+        from langchain_core.messages import AIMessageChunk
+
+        for text in self.chunks:
+            yield AIMessageChunk(content=text)
+
+
+@pytest.mark.parametrize("tick,writes", [
+    # A stalled clock: only newlines and the end of the stream write
+    (0.0, ["Hello\n", "wörld"]),
+    # Chunks arriving further apart than the interval are written at once
+    (1.0, ["Hel", "lo\n", "wö", "rld"]),
+])
+def test_stream_agent_response_flushes(monkeypatch, tick, writes):
+    """Test that streamed output is written at newlines or once the interval passes."""
+    import asyncio
+    import itertools
+    from types import SimpleNamespace
+    from deepagents_sample.examples import example4_streaming_responses as example4
+
+    class _Stdout:
+        def __init__(self):
+            self.writes = []
+
+        def write(self, text):
+            self.writes.append(text)
+
+        def flush(self):
+            pass
+
+    stdout = _Stdout()
+    clock = itertools.count(0.0, tick)
+    monkeypatch.setattr(example4.sys, "stdout", stdout)
+    # Patch the module's clock only; the event loop reads time.monotonic too
+    monkeypatch.setattr(example4, "time", SimpleNamespace(monotonic=lambda: next(clock)))
+    monkeypatch.setattr(
+        example4, "get_model",
+        lambda *args, **kwargs: _StubStreamingModel(["Hel", "lo\n", "wö", "rld"])
+    )
+
+    assert asyncio.run(example4.stream_agent_response(None, "task")) == "Hello\nwörld"
+    assert stdout.writes[:len(writes)] == writes
+
+
+def test_agent_interfaces():
+    """Test that agent classes expose the expected methods."""
     from deepagents_sample.agents import CoordinatorAgent, ResearchAgent, AnalysisAgent
-    from deepagents_sample.middleware import MiddlewareChain, MetricsMiddleware
-    
-    try:
-        # Create middleware
-        middleware = MiddlewareChain()
-        middleware.add(MetricsMiddleware())
-        print("✅ Middleware created")
-        
-        # Test agent creation without LLM (no API key needed)
-        print("\nTesting agent creation (without LLM):")
-        
-        # These will fail without API key, but we can test the structure
-        try:
-            from langchain_openai import ChatOpenAI
-            if os.getenv("OPENAI_API_KEY"):
-                model = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-                
-                coordinator = CoordinatorAgent(model=model, middleware_chain=middleware)
-                print("✅ CoordinatorAgent created")
-                
-                research = ResearchAgent(model=model, middleware_chain=middleware)
-                print("✅ ResearchAgent created")
-                
-                analysis = AnalysisAgent(model=model, middleware_chain=middleware)
-                print("✅ AnalysisAgent created")
-                
-                # Test subagent registration
-                coordinator.register_subagent("research", research)
-                coordinator.register_subagent("analysis", analysis)
-                print("✅ Subagents registered")
-                
-                print("\n✅ All agent tests PASSED (with LLM)")
-            else:
-                print("⚠️  OPENAI_API_KEY not set")
-                print("   Testing agent structure only...")
-                
-                # Test that classes exist and have expected methods
-                assert hasattr(CoordinatorAgent, 'process')
-                assert hasattr(ResearchAgent, 'process')
-                assert hasattr(AnalysisAgent, 'process')
-                print("✅ Agent classes have required methods")
-                
-                print("\n✅ Agent structure tests PASSED (no LLM)")
-        
-        except Exception as e:
-            print(f"⚠️  Agent creation skipped: {e}")
-            print("   (This is expected without OPENAI_API_KEY)")
-        
-        return True
-        
-    except Exception as e:
-        print(f"\n❌ Agent test FAILED: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-
-
-def test_workflow():
-    """Test LangGraph workflow structure."""
-    print_section("TEST 6: LangGraph Workflow")
-    
-    from deepagents_sample.workflow import AgentState, create_agent_workflow
-    from deepagents_sample.workflow.state import create_initial_state
-    
-    try:
-        # Test state creation
-        state = create_initial_state("test task")
-        assert state['current_task'] == "test task"
-        assert state['messages'] == []
-        assert state['results'] == {}
-        print("✅ AgentState creation works")
-        
-        # Test state helper functions
-        from deepagents_sample.workflow.state import add_agent_to_history, add_result
-        state = add_agent_to_history(state, "test_agent")
-        assert "test_agent" in state['agent_history']
-        print("✅ State helper functions work")
-        
-        # Test workflow creation (structure only, no execution)
-        if os.getenv("OPENAI_API_KEY"):
-            from langchain_openai import ChatOpenAI
-            from deepagents_sample.agents import CoordinatorAgent, ResearchAgent, AnalysisAgent
-            from deepagents_sample.middleware import MiddlewareChain
-            
-            model = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-            middleware = MiddlewareChain()
-            
-            coordinator = CoordinatorAgent(model=model, middleware_chain=middleware)
-            research = ResearchAgent(model=model, middleware_chain=middleware)
-            analysis = AnalysisAgent(model=model, middleware_chain=middleware)
-            
-            workflow = create_agent_workflow(coordinator, research, analysis)
-            print("✅ Workflow graph created")
-            
-            print("\n✅ All workflow tests PASSED (with LLM)")
-        else:
-            print("⚠️  OPENAI_API_KEY not set")
-            print("   Workflow structure verified")
-            print("\n✅ Workflow structure tests PASSED (no LLM)")
-        
-        return True
-        
-    except Exception as e:
-        print(f"\n❌ Workflow test FAILED: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+
+    assert hasattr(CoordinatorAgent, 'process')
+    assert hasattr(ResearchAgent, 'process')
+    assert hasattr(AnalysisAgent, 'process')
+
+
+def test_agents(coordinator_agent, research_agent, analysis_agent):
+    """Test agent creation and subagent registration."""
+    coordinator_agent.register_subagent("research", research_agent)
+    coordinator_agent.register_subagent("analysis", analysis_agent)
+
+
+def test_workflow_state():
+    """Test LangGraph workflow state helpers."""
+    from deepagents_sample.workflow.state import (
+        create_initial_state, add_agent_to_history
+    )
+
+    # Test state creation
+    state = create_initial_state("test task")
+    assert state['current_task'] == "test task"
+    assert state['messages'] == []
+    assert state['results'] == {}
+
+    # Test state helper functions
+    state = add_agent_to_history(state, "test_agent")
+    assert "test_agent" in state['agent_history']
+
+
+def test_workflow(coordinator_agent, research_agent, analysis_agent):
+    """Test LangGraph workflow creation (structure only, no execution)."""
+    from deepagents_sample.workflow import create_agent_workflow
+
+    assert create_agent_workflow(coordinator_agent, research_agent, analysis_agent) is not None
+
+
+@pytest.mark.parametrize("task,route", [
+    ("Search the logs for errors", "research"),
+    ("run the disk usage command", "research"),
+    ("Summarize last quarter's numbers", "analysis"),
+    ("Analyse these metrics", "analysis"),
+    ("Find the outliers and write a report", None),
+    ("Hello there", None),
+    ("Researching analytics", None),
+])
+def test_keyword_route(task, route):
+    """Test keyword routing: one list matching picks a route, otherwise the LLM decides."""
+    from deepagents_sample.workflow.graph import _keyword_route
+
+    assert _keyword_route(task) == route
+
+
+def test_workflow_results_reducer():
+    """Test that the results reducer merges dicts without mutating either side."""
+    from deepagents_sample.workflow.state import _merge_dict
+
+    current = {"research_agent": "old", "kept": 1}
+    update = {"research_agent": "new", "added": 2}
+
+    merged = _merge_dict(current, update)
+    assert merged == {"research_agent": "new", "kept": 1, "added": 2}
+    assert current == {"research_agent": "old", "kept": 1}
+    assert update == {"research_agent": "new", "added": 2}
+
+
+class _StubCoordinator:
+    """Coordinator that always routes to research and joins agent names."""
+
+    def process(self, prompt):
+        return "research_agent"
+
+    def aggregate_results(self, results):
+        return "AGG:" + ",".join(r["agent"] for r in results)
+
+
+class _StubSubagent:
+    """Subagent that echoes the task back."""
+
+    def process(self, task):
+        return "found " + task
+
+
+def test_workflow_run_merges_results():
+    """Test a full workflow run with stub agents (no LLM needed)."""
+    from deepagents_sample.workflow import create_agent_workflow, run_workflow
+
+    workflow = create_agent_workflow(_StubCoordinator(), _StubSubagent(), _StubSubagent())
+    state = run_workflow(workflow, "do a thing", verbose=False)
+
+    assert state['results'] == {"research_agent": "found do a thing"}
+    assert "research_agent" in state['agent_history']
 
 
 def test_examples():
-    """Test that example files exist and are executable."""
-    print_section("TEST 7: Example Files")
-    
-    examples = [
-        "src/deepagents_sample/examples/example1_basic_middleware.py",
-        "src/deepagents_sample/examples/example2_langgraph_subagents.py",
-        "src/deepagents_sample/examples/example3_mcp_tools.py",
-        "src/deepagents_sample/examples/run_all.py",
-    ]
-    
-    passed = 0
-    for example in examples:
-        path = Path(example)
-        if path.exists():
-            print(f"✅ {path.name:40s} - EXISTS")
-            passed += 1
-        else:
-            print(f"❌ {path.name:40s} - MISSING")
-    
-    print(f"\nExample Files: {passed}/{len(examples)} found")
-    return passed == len(examples)
+    """Test that example files exist."""
+    missing = _missing_files(EXAMPLE_FILES)
+    assert not missing, f"Missing example files: {missing}"
 
 
 def test_documentation():
     """Test that documentation files exist."""
-    print_section("TEST 8: Documentation")
-    
-    docs = [
-        ("README.md", "Main documentation"),
-        ("QUICKSTART.md", "Quick start guide"),
-        (".project-summary.md", "Project summary"),
-        ("pyproject.toml", "Project configuration"),
-        ("data/sample.json", "Sample data"),
+    missing = [
+        f"{doc} ({DOC_FILES[doc]})"
+        for doc in _missing_files(DOC_FILES)
     ]
-    
-    passed = 0
-    for doc, description in docs:
-        path = Path(doc)
-        if path.exists():
-            size = path.stat().st_size
-            print(f"✅ {doc:30s} - {description:30s} ({size} bytes)")
-            passed += 1
-        else:
-            print(f"❌ {doc:30s} - MISSING")
-    
-    print(f"\nDocumentation: {passed}/{len(docs)} found")
-    return passed == len(docs)
+    assert not missing, f"Missing documentation files: {missing}"
 
 
 def main():
-    """Run all tests."""
-    print("\n" + "="*70)
-    print("  DEEPAGENTS SAMPLE PROJECT - COMPREHENSIVE TEST SUITE")
-    print("="*70)
-    
-    results = []
-    
-    # Run all tests
-    results.append(("Module Imports", test_imports()))
-    results.append(("Middleware", test_middleware()))
-    results.append(("CommandTool", test_command_tool()))
-    results.append(("JSONSearchTool", test_json_tool()))
-    results.append(("Agents", test_agents()))
-    results.append(("Workflow", test_workflow()))
-    results.append(("Examples", test_examples()))
-    results.append(("Documentation", test_documentation()))
-    
-    # Print summary
-    print_section("TEST SUMMARY")
-    
-    passed = sum(1 for _, result in results if result)
-    total = len(results)
-    
-    for name, result in results:
-        status = "✅ PASSED" if result else "❌ FAILED"
-        print(f"{name:30s} {status}")
-    
-    print(f"\n{'='*70}")
-    print(f"  TOTAL: {passed}/{total} test suites passed")
-    print(f"{'='*70}\n")
-    
-    if passed == total:
-        print("🎉 ALL TESTS PASSED! Project is working correctly.\n")
-        return 0
-    else:
-        print(f"⚠️  {total - passed} test suite(s) failed.\n")
-        return 1
+    """Run all tests through pytest."""
+    return pytest.main([__file__, "-v"])
 
 
 if __name__ == "__main__":